@@ -6,11 +6,14 @@ import json
 import gzip
 import logging
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Optional
 from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
+# Operaciones fallidas sin datos, agregadas por el collector en raw/{service}/{region}/
+ERRORS_FILENAME = "_errors.jsonl.gz"
+
 
 class DataIndexer:
     """Indexador de datos recolectados."""
@@ -51,12 +54,6 @@ class DataIndexer:
                     continue
                 
                 region_name = region_dir.name
-                index["regions"].add(region_name)
-                
-                region_data = {
-                    "operations": [],
-                    "count": 0
-                }
                 
                 # Procesar archivos de operaciones
                 for op_file in region_dir.glob("*.json.gz"):
@@ -67,74 +64,33 @@ class DataIndexer:
                         with gzip.open(op_file, 'rt', encoding='utf-8') as f:
                             data = json.load(f)
                         
-                        # Extraer información
-                        metadata = data.get("metadata", {})
-                        success = metadata.get("success", False)
-                        
-                        # Verificar si el error es de tipo "no disponible" (no es un error real)
-                        error = data.get("error", {})
-                        error_code = error.get("code", "") if isinstance(error, dict) else ""
-                        # También verificar si el metadata tiene el flag not_available
-                        metadata_not_available = metadata.get("not_available", False)
-                        # Códigos de error que indican "no disponible" (no son errores reales)
-                        # También incluir RequestExpired como "no disponible" ya que indica credenciales expiradas
-                        not_available_codes = ["OperationNotFound", "EndpointNotAvailable", "RequestExpired"]
-                        is_not_available = (
-                            metadata_not_available or 
-                            error_code in not_available_codes
+                        self._index_operation(
+                            index, service_name, service_data, region_name, op_name,
+                            data, str(op_file.relative_to(self.raw_dir))
                         )
                         
-                        operation_info = {
-                            "operation": op_name,
-                            "success": success,
-                            "paginated": metadata.get("paginated", False),
-                            "file": str(op_file.relative_to(self.raw_dir)),
-                            "error": error,
-                            "not_available": is_not_available  # Marcar si no está disponible
-                        }
-                        
-                        # Solo contar recursos si la operación fue exitosa y hay datos
-                        resource_count = 0
-                        if success:
-                            # Intentar contar recursos tanto de datos paginados como no paginados
-                            data_content = data.get("data", {})
-                            if not data_content:
-                                # Si no hay "data", intentar con el nivel superior
-                                data_content = data
-                            
-                            resource_count = self._count_resources(
-                                data_content,
-                                service_name=service_name,
-                                operation_name=op_name
-                            )
-                            if resource_count > 0:
-                                operation_info["resource_count"] = resource_count
-                        # NO asumir 1 recurso si no hay datos - esto causa conteos incorrectos
-                        
-                        region_data["operations"].append(operation_info)
-                        service_data["operations"].add(op_name)
-                        index["operations"][f"{service_name}:{region_name}"].append(op_name)
-                        index["total_operations"] += 1
-                        index["total_files"] += 1
-                        
-                        # Contar operaciones exitosas/fallidas por región
-                        # Ignorar operaciones "no disponibles" (OperationNotFound) como errores
-                        if success:
-                            if "successful" not in region_data:
-                                region_data["successful"] = 0
-                            region_data["successful"] += 1
-                        elif not is_not_available:  # Solo contar como fallida si no es "no disponible"
-                            if "failed" not in region_data:
-                                region_data["failed"] = 0
-                            region_data["failed"] += 1
-                        # Si es "not_available", no se cuenta ni como exitosa ni como fallida
-                        
                     except Exception as e:
                         logger.warning(f"Error indexando {op_file}: {e}")
                         continue
                 
+                # Operaciones fallidas sin datos: agregadas por región en un único JSONL
+                errors_file = region_dir / ERRORS_FILENAME
+                if errors_file.exists():
+                    errors_ref = str(errors_file.relative_to(self.raw_dir))
+                    for data in self._read_error_entries(errors_file):
+                        # Sin "file": los lectores hacen json.load del archivo de cada
+                        # operación y el de errores no es un único documento JSON
+                        self._index_operation(
+                            index, service_name, service_data, region_name,
+                            data.get("metadata", {}).get("operation", "unknown"),
+                            data, None, errors_file=errors_ref
+                        )
+                
+                # Regiones sin operaciones también se registran
+                self._region_entry(index, service_data, region_name)
+            
+            for region_data in service_data["regions"].values():
                 region_data["count"] = len(region_data["operations"])
-                service_data["regions"][region_name] = region_data
             
             service_data["total_operations"] = sum(
                 r["count"] for r in service_data["regions"].values()
@@ -166,6 +122,115 @@ class DataIndexer:
         
         return index
     
+    def _region_entry(self, index: Dict, service_data: Dict, region_name: str) -> Dict:
+        """Obtener (o crear) la entrada de una región dentro de un servicio."""
+        region_data = service_data["regions"].get(region_name)
+        if region_data is None:
+            index["regions"].add(region_name)
+            region_data = {
+                "operations": [],
+                "count": 0
+            }
+            service_data["regions"][region_name] = region_data
+        return region_data
+    
+    def _read_error_entries(self, errors_file: Path) -> Iterator[Dict]:
+        """Leer las operaciones fallidas agregadas en `_errors.jsonl.gz` (una por línea)."""
+        try:
+            with gzip.open(errors_file, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        logger.warning(f"Línea inválida en {errors_file}: {e}")
+        except (OSError, EOFError) as e:
+            # Un miembro gzip truncado (p.ej. ejecución interrumpida) no invalida lo leído
+            logger.warning(f"Error leyendo {errors_file}: {e}")
+    
+    def _index_operation(
+        self,
+        index: Dict,
+        service_name: str,
+        service_data: Dict,
+        region_name: str,
+        op_name: str,
+        data: Dict,
+        file_ref: Optional[str],
+        errors_file: Optional[str] = None
+    ):
+        """Registrar una operación recolectada en el índice.
+        
+        Las operaciones fallidas sin datos no tienen archivo propio (`file` es None);
+        `errors_file` indica el _errors.jsonl.gz donde está su línea.
+        """
+        region_data = self._region_entry(index, service_data, region_name)
+        
+        # Extraer información
+        metadata = data.get("metadata", {})
+        success = metadata.get("success", False)
+        
+        # Verificar si el error es de tipo "no disponible" (no es un error real)
+        error = data.get("error", {})
+        error_code = error.get("code", "") if isinstance(error, dict) else ""
+        # También verificar si el metadata tiene el flag not_available
+        metadata_not_available = metadata.get("not_available", False)
+        # Códigos de error que indican "no disponible" (no son errores reales)
+        # También incluir RequestExpired como "no disponible" ya que indica credenciales expiradas
+        not_available_codes = ["OperationNotFound", "EndpointNotAvailable", "RequestExpired"]
+        is_not_available = (
+            metadata_not_available or 
+            error_code in not_available_codes
+        )
+        
+        operation_info = {
+            "operation": op_name,
+            "success": success,
+            "paginated": metadata.get("paginated", False),
+            "file": file_ref,
+            "error": error,
+            "not_available": is_not_available  # Marcar si no está disponible
+        }
+        if errors_file:
+            operation_info["errors_file"] = errors_file
+        
+        # Solo contar recursos si la operación fue exitosa y hay datos
+        resource_count = 0
+        if success:
+            # Intentar contar recursos tanto de datos paginados como no paginados
+            data_content = data.get("data", {})
+            if not data_content:
+                # Si no hay "data", intentar con el nivel superior
+                data_content = data
+        
+            resource_count = self._count_resources(
+                data_content,
+                service_name=service_name,
+                operation_name=op_name
+            )
+            if resource_count > 0:
+                operation_info["resource_count"] = resource_count
+        # NO asumir 1 recurso si no hay datos - esto causa conteos incorrectos
+        
+        region_data["operations"].append(operation_info)
+        service_data["operations"].add(op_name)
+        index["operations"][f"{service_name}:{region_name}"].append(op_name)
+        index["total_operations"] += 1
+        index["total_files"] += 1
+        
+        # Contar operaciones exitosas/fallidas por región
+        # Ignorar operaciones "no disponibles" (OperationNotFound) como errores
+        if success:
+            if "successful" not in region_data:
+                region_data["successful"] = 0
+            region_data["successful"] += 1
+        elif not is_not_available:  # Solo contar como fallida si no es "no disponible"
+            if "failed" not in region_data:
+                region_data["failed"] = 0
+            region_data["failed"] += 1
+        # Si es "not_available", no se cuenta ni como exitosa ni como fallida
+    
     def _is_aws_managed_iam_resource(self, item: Dict) -> bool:
         """Verificar si un recurso de IAM es gestionado por AWS."""
         if not isinstance(item, dict):
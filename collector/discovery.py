@@ -6,28 +6,140 @@ operaciones disponibles y determinar qué parámetros son requeridos.
 """
 
 import logging
-from typing import Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set
 import boto3
 from botocore.client import BaseClient
+from botocore.config import Config
 from botocore.exceptions import ClientError, EndpointConnectionError
 from botocore.model import OperationModel, ServiceModel
 
 logger = logging.getLogger(__name__)
 
+# Operaciones de lectura permitidas
+_READ_PREFIXES = (
+    'list',      # ListBuckets, ListUsers, etc.
+    'describe',  # DescribeInstances, DescribeDBInstances, etc.
+    'get',       # GetUser, GetBucket, etc.
+    'batchget',  # BatchGetItem, BatchGetImage, etc.
+    'batchdescribe',  # BatchDescribe*
+    'scan',      # DynamoDB Scan
+    'query',     # DynamoDB Query, Athena Query
+    'select',    # S3 Select
+    'head',      # S3 HeadObject, HeadBucket
+    'search',    # SearchDomains, SearchResources, etc.
+    'lookup',    # LookupEvents, LookupAttributeKey, etc.
+    'check',     # CheckDomainAvailability, etc. (solo lectura)
+    'validate',  # ValidateTemplate, ValidateConfiguration, etc. (solo lectura)
+    'estimate',  # EstimateCost, etc. (solo lectura)
+    'view',      # ViewBilling, etc. (solo lectura)
+    'fetch',     # FetchAttributes, etc. (solo lectura)
+)
+
+# Operaciones de lectura específicas (por nombre exacto o patrón)
+_READ_OPERATIONS = frozenset({
+    'assumeroletrust',  # AssumeRoleTrust (lectura de política)
+    'getcalleridentity',  # GetCallerIdentity (lectura)
+    'getaccountauthorizationdetails',  # GetAccountAuthorizationDetails (lectura)
+})
+
+# Operaciones de escritura que DEBEN ser excluidas
+_WRITE_PREFIXES = (
+    'create',    # CreateBucket, CreateUser, etc.
+    'delete',    # DeleteBucket, DeleteUser, etc.
+    'update',    # UpdateUser, UpdateBucket, etc.
+    'put',       # PutObject, PutItem, etc.
+    'modify',    # ModifyInstance, ModifyDBInstance, etc.
+    'add',       # AddTags, AddPermission, etc.
+    'remove',    # RemoveTags, RemovePermission, etc.
+    'attach',    # AttachRolePolicy, AttachVolume, etc.
+    'detach',    # DetachRolePolicy, DetachVolume, etc.
+    'associate', # AssociateRouteTable, etc.
+    'disassociate', # DisassociateRouteTable, etc.
+    'enable',    # EnableLogging, EnableMetrics, etc.
+    'disable',   # DisableLogging, DisableMetrics, etc.
+    'start',     # StartInstance, StartJob, etc.
+    'stop',      # StopInstance, StopJob, etc.
+    'terminate', # TerminateInstance, etc.
+    'reboot',    # RebootInstance, etc.
+    'restore',   # RestoreDBInstance, etc.
+    'copy',      # CopyObject, CopySnapshot, etc.
+    'move',      # MoveObject, etc.
+    'import',    # ImportImage, ImportSnapshot, etc.
+    'export',    # ExportImage, ExportSnapshot, etc.
+    'invoke',    # InvokeFunction, InvokeEndpoint, etc.
+    'send',      # SendMessage, SendCommand, etc.
+    'publish',   # PublishMessage, PublishTopic, etc.
+    'subscribe', # Subscribe, etc.
+    'unsubscribe', # Unsubscribe, etc.
+    'authorize', # AuthorizeSecurityGroupIngress, etc.
+    'revoke',    # RevokeSecurityGroupIngress, etc.
+    'grant',     # GrantPermission, etc.
+    'deny',      # DenyPermission, etc.
+    'set',       # SetBucketPolicy, SetUserPolicy, etc.
+    'reset',     # ResetPassword, etc.
+    'change',    # ChangePassword, ChangeResourceRecordSets, etc.
+    'register',  # RegisterInstance, RegisterTarget, etc.
+    'deregister', # DeregisterInstance, DeregisterTarget, etc.
+    'activate',  # ActivateLicense, etc.
+    'deactivate', # DeactivateLicense, etc.
+    'cancel',    # CancelJob, CancelExportTask, etc.
+    'abort',     # AbortMultipartUpload, etc.
+    'complete',  # CompleteMultipartUpload, etc.
+    'initiate',  # InitiateMultipartUpload, etc.
+    'upload',    # UploadPart, etc.
+    'download',  # DownloadDBLogFile, etc.
+    'restart',   # RestartAppServer, etc.
+    'resume',    # ResumeProcesses, etc.
+    'suspend',   # SuspendProcesses, etc.
+    'scale',     # ScaleOut, ScaleIn, etc.
+    'tag',       # TagResource, etc.
+    'untag',     # UntagResource, etc.
+)
+
+# Primeras letras posibles de una operación de lectura
+_READ_FIRST_CHARS = frozenset(
+    name[0] for name in (*_READ_PREFIXES, *_READ_OPERATIONS)
+)
+
+# Campos de salida que indican que una operación es paginada
+_PAGINATION_INDICATORS = frozenset({'NextToken', 'Marker', 'NextPageToken', 'nextToken'})
+# Campos de salida (en minúsculas) que sugieren una lista de resultados
+_RESULT_LIST_HINTS = frozenset({'items', 'results', 'list', 'values'})
+
 
 class ServiceDiscovery:
     """Descubrimiento de servicios y operaciones AWS."""
     
-    def __init__(self, session: boto3.Session):
+    def __init__(
+        self,
+        session: boto3.Session,
+        config: Optional[Config] = None,
+        client_factory: Optional[Callable[[str, str], Any]] = None
+    ):
         self.session = session
+        # Configuración de clientes (timeouts, reintentos) compartida con el Collector
+        self.config = config
+        # Fuente de clientes compartida (p.ej. el cache del executor); sin ella se crea
+        # un cliente nuevo de la sesión en cada verificación de región
+        self.client_factory = client_factory
         self._service_cache: Dict[str, ServiceModel] = {}
+        # Lista de servicios: botocore la obtiene recorriendo sus directorios de datos
+        # en cada llamada y no cambia durante el proceso, así que se calcula una vez.
+        self._available_services: Optional[List[str]] = None
+        # Operaciones de lectura analizadas por servicio: no dependen de la región, así que
+        # todas las regiones comparten el mismo análisis (y los mismos dicts de operación)
+        self._operations_cache: Dict[str, Dict[str, Dict]] = {}
     
     def discover_services(self) -> List[str]:
         """Descubrir todos los servicios AWS disponibles."""
+        if self._available_services is not None:
+            return list(self._available_services)
+        
         try:
             services = self.session.get_available_services()
             logger.info(f"Servicios disponibles: {len(services)}")
-            return sorted(services)
+            self._available_services = sorted(services)
+            return list(self._available_services)
         except Exception as e:
             logger.error(f"Error descubriendo servicios: {e}")
             return []
@@ -39,8 +151,6 @@ class ServiceDiscovery:
     ) -> Dict[str, Dict]:
         """Descubrir operaciones de un servicio en una región."""
         operations = {}
-        total_operations = 0
-        filtered_operations = 0
         
         try:
             # Obtener modelo del servicio
@@ -50,44 +160,67 @@ class ServiceDiscovery:
             
             # Crear cliente para verificar disponibilidad en región
             try:
-                client = self.session.client(service_name, region_name=region)
+                if self.client_factory is not None:
+                    self.client_factory(service_name, region)
+                else:
+                    self.session.client(service_name, region_name=region, config=self.config)
             except Exception as e:
                 logger.debug(f"Servicio {service_name} no disponible en {region}: {e}")
                 return operations
             
-            # Iterar sobre todas las operaciones
-            # FILTRAR: Solo incluir operaciones de lectura (List, Describe, Get, etc.)
-            # Excluir operaciones de escritura (Create, Delete, Update, Put, etc.)
-            for operation_name in service_model.operation_names:
-                total_operations += 1
-                
-                # Filtrar solo operaciones de lectura
-                if not self._is_read_operation(operation_name):
-                    filtered_operations += 1
-                    logger.debug(f"Excluyendo operación de escritura: {service_name}.{operation_name}")
-                    continue
-                
-                try:
-                    operation_model = service_model.operation_model(operation_name)
-                    op_info = self._analyze_operation(operation_model)
-                    if op_info:
-                        operations[operation_name] = op_info
-                except Exception as e:
-                    logger.debug(f"Error analizando {operation_name}: {e}")
-                    continue
-            
-            # Log informativo sobre el filtrado
-            if filtered_operations > 0:
-                logger.info(
-                    f"{service_name}/{region}: {len(operations)} operaciones de lectura "
-                    f"(se filtraron {filtered_operations} operaciones de escritura de {total_operations} totales)"
-                )
+            cached = self._operations_cache.get(service_name)
+            if cached is None:
+                cached = self._analyze_service_operations(service_name, service_model)
+                self._operations_cache[service_name] = cached
+            operations = dict(cached)
         
         except Exception as e:
             logger.warning(f"Error descubriendo operaciones de {service_name}: {e}")
         
         return operations
     
+    def _analyze_service_operations(
+        self,
+        service_name: str,
+        service_model: ServiceModel
+    ) -> Dict[str, Dict]:
+        """Analizar las operaciones de lectura de un servicio."""
+        operations = {}
+        total_operations = 0
+        filtered_operations = 0
+        
+        # Iterar sobre todas las operaciones
+        # FILTRAR: Solo incluir operaciones de lectura (List, Describe, Get, etc.)
+        # Excluir operaciones de escritura (Create, Delete, Update, Put, etc.)
+        for operation_name in service_model.operation_names:
+            total_operations += 1
+            # Un solo lower() por operación, compartido por filtro y clasificación
+            name_lower = operation_name.lower()
+            
+            # Filtrar solo operaciones de lectura
+            if not self._is_read_operation(name_lower):
+                filtered_operations += 1
+                logger.debug(f"Excluyendo operación de escritura: {service_name}.{operation_name}")
+                continue
+            
+            try:
+                operation_model = service_model.operation_model(operation_name)
+                op_info = self._analyze_operation(operation_model, name_lower)
+                if op_info:
+                    operations[operation_name] = op_info
+            except Exception as e:
+                logger.debug(f"Error analizando {operation_name}: {e}")
+                continue
+        
+        # Log informativo sobre el filtrado
+        if filtered_operations > 0:
+            logger.info(
+                f"{service_name}: {len(operations)} operaciones de lectura "
+                f"(se filtraron {filtered_operations} operaciones de escritura de {total_operations} totales)"
+            )
+        
+        return operations
+    
     def _get_service_model(self, service_name: str) -> Optional[ServiceModel]:
         """Obtener modelo del servicio desde cache o botocore."""
         if service_name in self._service_cache:
@@ -103,7 +236,11 @@ class ServiceDiscovery:
             logger.debug(f"No se pudo cargar modelo para {service_name}: {e}")
             return None
     
-    def _analyze_operation(self, operation_model: OperationModel) -> Optional[Dict]:
+    def _analyze_operation(
+        self,
+        operation_model: OperationModel,
+        name_lower: Optional[str] = None
+    ) -> Optional[Dict]:
         """Analizar una operación para determinar parámetros requeridos."""
         try:
             input_shape = operation_model.input_shape
@@ -138,7 +275,7 @@ class ServiceDiscovery:
             safe_to_call = len(required_params) == 0
             
             # Clasificar tipo de operación
-            op_type = self._classify_operation(operation_model.name)
+            op_type = self._classify_operation(name_lower or operation_model.name.lower())
             
             return {
                 "name": operation_model.name,
@@ -149,14 +286,12 @@ class ServiceDiscovery:
                 "paginated": self._is_paginated(operation_model)
             }
         
-        except Exception as e:
+        except (AttributeError, KeyError) as e:
             logger.debug(f"Error analizando operación {operation_model.name}: {e}")
             return None
     
-    def _classify_operation(self, operation_name: str) -> str:
-        """Clasificar tipo de operación basado en el nombre."""
-        name_lower = operation_name.lower()
-        
+    def _classify_operation(self, name_lower: str) -> str:
+        """Clasificar tipo de operación basado en el nombre (ya en minúsculas)."""
         if name_lower.startswith('list') or name_lower.startswith('describe'):
             return "list"
         elif name_lower.startswith('get'):
@@ -166,102 +301,24 @@ class ServiceDiscovery:
         else:
             return "other"
     
-    def _is_read_operation(self, operation_name: str) -> bool:
-        """Determinar si una operación es de solo lectura (safe para ejecutar)."""
-        name_lower = operation_name.lower()
-        
-        # Operaciones de lectura permitidas
-        read_prefixes = [
-            'list',      # ListBuckets, ListUsers, etc.
-            'describe',  # DescribeInstances, DescribeDBInstances, etc.
-            'get',       # GetUser, GetBucket, etc.
-            'batchget',  # BatchGetItem, BatchGetImage, etc.
-            'batchdescribe',  # BatchDescribe*
-            'scan',      # DynamoDB Scan
-            'query',     # DynamoDB Query, Athena Query
-            'select',    # S3 Select
-            'head',      # S3 HeadObject, HeadBucket
-            'search',    # SearchDomains, SearchResources, etc.
-            'lookup',    # LookupEvents, LookupAttributeKey, etc.
-            'check',     # CheckDomainAvailability, etc. (solo lectura)
-            'validate',  # ValidateTemplate, ValidateConfiguration, etc. (solo lectura)
-            'estimate',  # EstimateCost, etc. (solo lectura)
-            'view',      # ViewBilling, etc. (solo lectura)
-            'fetch',     # FetchAttributes, etc. (solo lectura)
-        ]
-        
-        # Operaciones de lectura específicas (por nombre exacto o patrón)
-        read_operations = [
-            'assumeroletrust',  # AssumeRoleTrust (lectura de política)
-            'getcalleridentity',  # GetCallerIdentity (lectura)
-            'getaccountauthorizationdetails',  # GetAccountAuthorizationDetails (lectura)
-        ]
+    def _is_read_operation(self, name_lower: str) -> bool:
+        """Determinar si una operación (nombre en minúsculas) es de solo lectura."""
+        # Filtro rápido por primera letra: la mayoría de operaciones de escritura
+        # (Put, Modify, Terminate, ...) se descartan sin recorrer los prefijos.
+        if not name_lower or name_lower[0] not in _READ_FIRST_CHARS:
+            return False
         
         # Verificar operaciones específicas primero
-        if name_lower in read_operations:
+        if name_lower in _READ_OPERATIONS:
             return True
         
         # Verificar si empieza con algún prefijo de lectura
-        for prefix in read_prefixes:
+        for prefix in _READ_PREFIXES:
             if name_lower.startswith(prefix):
                 return True
         
-        # Operaciones de escritura que DEBEN ser excluidas
-        write_prefixes = [
-            'create',    # CreateBucket, CreateUser, etc.
-            'delete',    # DeleteBucket, DeleteUser, etc.
-            'update',    # UpdateUser, UpdateBucket, etc.
-            'put',       # PutObject, PutItem, etc.
-            'modify',    # ModifyInstance, ModifyDBInstance, etc.
-            'add',       # AddTags, AddPermission, etc.
-            'remove',    # RemoveTags, RemovePermission, etc.
-            'attach',    # AttachRolePolicy, AttachVolume, etc.
-            'detach',    # DetachRolePolicy, DetachVolume, etc.
-            'associate', # AssociateRouteTable, etc.
-            'disassociate', # DisassociateRouteTable, etc.
-            'enable',    # EnableLogging, EnableMetrics, etc.
-            'disable',   # DisableLogging, DisableMetrics, etc.
-            'start',     # StartInstance, StartJob, etc.
-            'stop',      # StopInstance, StopJob, etc.
-            'terminate', # TerminateInstance, etc.
-            'reboot',    # RebootInstance, etc.
-            'restore',   # RestoreDBInstance, etc.
-            'copy',      # CopyObject, CopySnapshot, etc.
-            'move',      # MoveObject, etc.
-            'import',    # ImportImage, ImportSnapshot, etc.
-            'export',    # ExportImage, ExportSnapshot, etc.
-            'invoke',    # InvokeFunction, InvokeEndpoint, etc.
-            'send',      # SendMessage, SendCommand, etc.
-            'publish',   # PublishMessage, PublishTopic, etc.
-            'subscribe', # Subscribe, etc.
-            'unsubscribe', # Unsubscribe, etc.
-            'authorize', # AuthorizeSecurityGroupIngress, etc.
-            'revoke',    # RevokeSecurityGroupIngress, etc.
-            'grant',     # GrantPermission, etc.
-            'deny',      # DenyPermission, etc.
-            'set',       # SetBucketPolicy, SetUserPolicy, etc.
-            'reset',     # ResetPassword, etc.
-            'change',    # ChangePassword, ChangeResourceRecordSets, etc.
-            'register',  # RegisterInstance, RegisterTarget, etc.
-            'deregister', # DeregisterInstance, DeregisterTarget, etc.
-            'activate',  # ActivateLicense, etc.
-            'deactivate', # DeactivateLicense, etc.
-            'cancel',    # CancelJob, CancelExportTask, etc.
-            'abort',     # AbortMultipartUpload, etc.
-            'complete',  # CompleteMultipartUpload, etc.
-            'initiate',  # InitiateMultipartUpload, etc.
-            'upload',    # UploadPart, etc.
-            'download',  # DownloadDBLogFile, etc.
-            'restart',   # RestartAppServer, etc.
-            'resume',    # ResumeProcesses, etc.
-            'suspend',   # SuspendProcesses, etc.
-            'scale',     # ScaleOut, ScaleIn, etc.
-            'tag',       # TagResource, etc.
-            'untag',     # UntagResource, etc.
-        ]
-        
         # Si empieza con algún prefijo de escritura, excluir
-        for prefix in write_prefixes:
+        for prefix in _WRITE_PREFIXES:
             if name_lower.startswith(prefix):
                 return False
         
@@ -278,19 +335,14 @@ class ServiceDiscovery:
             
             # Buscar indicadores de paginación comunes
             members = output_shape.members if hasattr(output_shape, 'members') else {}
+            keys = members.keys()
             
             # Común: NextToken, Marker, NextPageToken
-            pagination_indicators = ['NextToken', 'Marker', 'NextPageToken', 'nextToken']
-            for indicator in pagination_indicators:
-                if indicator in members:
-                    return True
+            if not _PAGINATION_INDICATORS.isdisjoint(keys):
+                return True
             
             # También verificar si hay un campo que sugiere múltiples resultados
-            for key in members.keys():
-                if key.lower() in ['items', 'results', 'list', 'values']:
-                    return True
-            
-            return False
-        except:
+            return any(key.lower() in _RESULT_LIST_HINTS for key in keys)
+        except AttributeError:
             return False
 
@@ -3,19 +3,26 @@ Operation Executor - Ejecución de operaciones AWS con manejo de errores,
 retry, y seguimiento de operaciones que requieren parámetros.
 """
 
+import functools
+import gzip
+import json
 import logging
+import os
 import time
-import random
 import re
-import signal
-from typing import Dict, List, Optional, Any
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Any, Set, Tuple
 import boto3
 from botocore.exceptions import (
     ClientError, 
     EndpointConnectionError,
     ConnectTimeoutError,
     ReadTimeoutError,
-    ConnectionError as BotoConnectionError
+    ConnectionError as BotoConnectionError,
+    ParamValidationError
 )
 from botocore.client import BaseClient
 from botocore.config import Config
@@ -156,19 +163,182 @@ _PARAMETER_ERRORS: frozenset = frozenset({
     "InternalFailure",
 })
 
+# Códigos de throttling / saturación del servicio. botocore los reintenta (modo
+# adaptive); si llegan hasta aquí, se agotaron los reintentos.
+_THROTTLING_ERRORS: frozenset = frozenset({
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "RequestLimitExceeded",
+    "SlowDown",
+    "ServiceUnavailable",
+    "RequestThrottled",
+})
+
+# Mensajes (en minúsculas) de errores inesperados que en realidad son esperados:
+# el servicio u operación no está disponible. Se registran en debug, no como warning.
+_EXPECTED_ERROR_RE = re.compile("|".join(map(re.escape, (
+    "unable to locate authorization token",  # CodeCatalyst
+    "has no attribute",
+    "operation not found",
+    "not implemented",
+    "service not available",
+))))
+
+# Códigos de acceso denegado: esperados con permisos de solo lectura acotados
+_ACCESS_DENIED_ERRORS: frozenset = frozenset({"AccessDenied", "UnauthorizedOperation"})
+
+# Categoría de cada código de ClientError. Se construye de menor a mayor
+# precedencia para que, ante un código repetido, gane la categoría más específica.
+_ERROR_CATEGORIES: Dict[str, str] = {
+    **dict.fromkeys(_PARAMETER_ERRORS, "parameter"),
+    **dict.fromkeys(_KNOWN_OPERATIONAL_ERRORS, "operational"),
+    **dict.fromkeys(_THROTTLING_ERRORS, "throttling"),
+    **dict.fromkeys(_ACCESS_DENIED_ERRORS, "access_denied"),
+}
+
+# Espera máxima (segundos) aceptada desde un Retry-After del servicio
+_MAX_RETRY_AFTER = 30.0
+
+
+def _retry_after_seconds(error: ClientError) -> Optional[float]:
+    """Espera pedida por el servicio en una respuesta de throttling, si la indica.
+    
+    Acepta `Retry-After` (segundos o fecha HTTP) y `x-amz-retry-after`
+    (milisegundos). El valor se limita a [0, _MAX_RETRY_AFTER].
+    """
+    headers = error.response.get('ResponseMetadata', {}).get('HTTPHeaders', {})
+    delay = None
+    try:
+        if 'x-amz-retry-after' in headers:
+            delay = int(headers['x-amz-retry-after']) / 1000.0
+        elif 'retry-after' in headers:
+            value = headers['retry-after'].strip()
+            if value.isdigit():
+                delay = float(value)
+            else:
+                retry_at = parsedate_to_datetime(value)
+                delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    except (TypeError, ValueError):
+        return None
+    if delay is None:
+        return None
+    return min(max(delay, 0.0), _MAX_RETRY_AFTER)
+
+
+def _strip_response_metadata(response: Any) -> Any:
+    """Quitar ResponseMetadata (request id, cabeceras HTTP, reintentos) de una respuesta.
+    
+    Ningún análisis lo usa y ocupa una parte apreciable de cada página guardada.
+    """
+    if isinstance(response, dict):
+        response.pop("ResponseMetadata", None)
+    return response
+
 
-def _pascal_to_snake(name: str) -> str:
-    """Convertir PascalCase a snake_case."""
-    # Insertar underscore antes de mayúsculas (excepto la primera)
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-    # Insertar underscore antes de mayúsculas seguidas de minúsculas
-    s2 = re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1)
-    return s2.lower()
+# Mínimo de conexiones HTTP por cliente (el default de botocore es 10)
+_MIN_POOL_CONNECTIONS = 32
+
+# Intentos totales por llamada (incluye el primero) en el retry adaptive de botocore
+_MAX_ATTEMPTS = 5
+
+# Tamaño de página por (servicio, método snake_case) para operaciones de inventario
+# voluminosas cuyo máximo documentado supera el default de la API: menos round-trips.
+_PAGE_SIZE_OVERRIDES: Dict[Tuple[str, str], int] = {
+    ("ec2", "describe_instances"): 1000,
+    ("ec2", "describe_snapshots"): 1000,
+    ("ec2", "describe_images"): 1000,
+    ("ec2", "describe_volumes"): 500,
+    ("ec2", "describe_security_groups"): 1000,
+    ("ec2", "describe_network_interfaces"): 1000,
+    ("ec2", "describe_subnets"): 1000,
+    ("ec2", "describe_vpcs"): 1000,
+    ("ec2", "describe_nat_gateways"): 1000,
+    ("ec2", "describe_internet_gateways"): 1000,
+    ("iam", "list_roles"): 1000,
+    ("iam", "list_users"): 1000,
+    ("iam", "list_policies"): 1000,
+}
+
+# Claves de respuesta que contienen la lista de items de una operación List
+_ITEM_KEYS = frozenset({"HostedZones", "HostedZoneSummaries", "Items", "Results", "Values"})
+
+# Claves genéricas donde suele venir el identificador de un item
+_FALLBACK_ID_KEYS = ("Id", "ID", "id", "Arn", "ARN", "arn")
+# Parámetros de Route 53 cuyo valor puede venir como /hostedzone/Z...
+_HOSTED_ZONE_PARAMS = frozenset({"hostedzoneid", "hostedzone"})
+
+
+@functools.lru_cache(maxsize=1024)
+def _id_key_variants(param_name: str) -> Tuple[Tuple[str, bool], ...]:
+    """Claves candidatas para el valor de `param_name`, en orden de preferencia.
+    
+    Cada clave va con un flag que indica si su valor es un HostedZoneId de Route 53
+    que puede requerir limpieza del prefijo /hostedzone/.
+    """
+    variants = [(param_name, param_name.lower() in _HOSTED_ZONE_PARAMS)]
+    for key in (f"{param_name}Id", f"{param_name}_id", *_FALLBACK_ID_KEYS):
+        variants.append((key, "hostedzone" in key.lower()))
+    return tuple(variants)
+
+
+@functools.lru_cache(maxsize=1024)
+def _id_key_set(param_name: str) -> frozenset:
+    """Conjunto de las claves de `_id_key_variants`, para intersecarlo con un item."""
+    return frozenset(key for key, _ in _id_key_variants(param_name))
+
+
+# Formato esperado de IDs por (servicio, parámetro). Los candidatos inferidos que no
+# encajan se descartan antes de llamar a la API.
+_PARAM_ID_PATTERNS: Dict[Tuple[str, str], re.Pattern] = {
+    ("ec2", "InstanceId"): re.compile(r"i-[0-9a-f]+"),
+    ("ec2", "VolumeId"): re.compile(r"vol-[0-9a-f]+"),
+    ("ec2", "SnapshotId"): re.compile(r"snap-[0-9a-f]+"),
+    ("ec2", "ImageId"): re.compile(r"ami-[0-9a-f]+"),
+    ("ec2", "VpcId"): re.compile(r"vpc-[0-9a-f]+"),
+    ("ec2", "SubnetId"): re.compile(r"subnet-[0-9a-f]+"),
+    ("ec2", "GroupId"): re.compile(r"sg-[0-9a-f]+"),
+    ("ec2", "NetworkInterfaceId"): re.compile(r"eni-[0-9a-f]+"),
+    ("ec2", "LaunchTemplateId"): re.compile(r"lt-[0-9a-f]+"),
+}
+
+
+def _is_plausible_param_value(service_name: str, param_name: str, value: str) -> bool:
+    """Validar de forma barata que un valor inferido tiene el formato del parámetro."""
+    pattern = _PARAM_ID_PATTERNS.get((service_name, param_name))
+    if pattern is not None:
+        return pattern.fullmatch(value) is not None
+    # Parámetros ARN: cualquier ARN empieza con "arn:" (arn:aws:, arn:aws-cn:, ...)
+    if param_name.endswith(("Arn", "ARN")):
+        return value.startswith("arn:")
+    return True
 
 
 class OperationExecutor:
     """Ejecutor de operaciones AWS con manejo inteligente de parámetros."""
     
+    # Atributos fijos: sin __dict__ por instancia y acceso por slot en los caminos calientes
+    __slots__ = (
+        "session",
+        "max_pages",
+        "max_followups",
+        "connect_timeout",
+        "read_timeout",
+        "operation_timeout",
+        "max_pool_connections",
+        "list_cache_path",
+        "list_cache_ttl",
+        "_client_cache",
+        "_list_results_cache",
+        "_method_cache",
+        "_throttled_until",
+        "_unavailable_endpoints",
+        "_paginator_cache",
+        "_list_cache_account",
+        "_client_lock",
+        "_cache_lock",
+    )
+    
     def __init__(
         self,
         session: boto3.Session,
@@ -176,7 +346,10 @@ class OperationExecutor:
         max_followups: int = 5,
         connect_timeout: int = 10,
         read_timeout: int = 30,
-        operation_timeout: int = 120
+        operation_timeout: int = 120,
+        max_pool_connections: int = 32,
+        list_cache_path: Optional[str] = None,
+        list_cache_ttl: int = 3600
     ):
         self.session = session
         self.max_pages = max_pages
@@ -184,8 +357,147 @@ class OperationExecutor:
         self.connect_timeout = connect_timeout
         self.read_timeout = read_timeout
         self.operation_timeout = operation_timeout
+        # Conexiones HTTP por cliente: el default de botocore (10) se queda corto
+        # cuando los threads del Collector comparten el mismo cliente.
+        self.max_pool_connections = max(_MIN_POOL_CONNECTIONS, max_pool_connections)
         self._client_cache: Dict[str, BaseClient] = {}
-        self._list_results_cache: Dict[str, List[Dict]] = {}
+        # Items de operaciones List por (servicio, región) → {operación: items}
+        self._list_results_cache: Dict[Tuple[str, str], Dict[str, List[Dict]]] = {}
+        # Método del cliente por servicio: {nombre de operación o método: método snake_case}
+        self._method_cache: Dict[str, Dict[str, str]] = {}
+        # Instante (reloj monotónico) hasta el que un (servicio, región) pidió no recibir
+        # llamadas mediante Retry-After, tras agotar los reintentos de botocore
+        self._throttled_until: Dict[Tuple[str, str], float] = {}
+        # (servicio, región) cuyo endpoint no existe: se responde sin volver a conectar
+        self._unavailable_endpoints: Set[Tuple[str, str]] = set()
+        # Paginators por (id del cliente, método); los clientes viven en _client_cache
+        self._paginator_cache: Dict[Tuple[int, str], Optional[Any]] = {}
+        # Persistencia opcional del cache de List entre ejecuciones: permite inferir
+        # parámetros de operaciones Get* que se ejecutan antes que su List* en el run.
+        # Se carga por cuenta con `load_list_cache`, una vez conocida la cuenta.
+        self.list_cache_path = Path(list_cache_path) if list_cache_path else None
+        self.list_cache_ttl = list_cache_ttl
+        self._list_cache_account: Optional[str] = None
+        # Los caches se comparten entre los threads del Collector
+        self._client_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+    
+    def load_list_cache(self, account_id: Optional[str]) -> None:
+        """Cargar el cache de List persistido de `account_id` si existe y no ha expirado.
+        
+        El archivo guarda una entrada por cuenta, así que los IDs de una cuenta nunca
+        se usan para inferir parámetros en otra. La cuenta queda registrada para
+        `save_list_cache`.
+        """
+        self._list_cache_account = account_id
+        path = self.list_cache_path
+        if not path or not account_id:
+            return
+        
+        entry = self._read_list_cache_file().get(account_id)
+        if not isinstance(entry, dict):
+            return
+        
+        try:
+            age = time.time() - float(entry.get("saved_at", 0))
+            if age > self.list_cache_ttl:
+                logger.info(
+                    f"Cache de List de la cuenta {account_id} expirado "
+                    f"({age:.0f}s > {self.list_cache_ttl}s), se ignora: {path}"
+                )
+                return
+            # Estructura por cuenta: {"saved_at": ts, "services": {servicio: {región: {operación: items}}}}
+            loaded = {
+                (service, region): dict(operations)
+                for service, regions in entry["services"].items()
+                for region, operations in regions.items()
+            }
+        except (KeyError, ValueError, AttributeError, TypeError) as e:
+            logger.warning(f"Cache de List ilegible para la cuenta {account_id}, se ignora {path}: {e}")
+            return
+        
+        with self._cache_lock:
+            self._list_results_cache.update(loaded)
+        logger.info(f"Cache de List cargado: {len(loaded)} servicio/región desde {path}")
+    
+    def _read_list_cache_file(self) -> Dict[str, Any]:
+        """Leer el archivo de cache de List completo ({} si no existe o es ilegible)."""
+        path = self.list_cache_path
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, EOFError, ValueError) as e:
+            # Un cache corrupto o truncado equivale a no tener cache
+            logger.warning(f"Cache de List ilegible, se ignora {path}: {e}")
+            return {}
+        return data if isinstance(data, dict) else {}
+    
+    def save_list_cache(self) -> None:
+        """Persistir el cache de List (si está configurado) para la siguiente ejecución.
+        
+        Se reemplaza solo la entrada de la cuenta actual; las de otras cuentas se
+        conservan mientras no hayan expirado.
+        """
+        path = self.list_cache_path
+        account_id = self._list_cache_account
+        if not path:
+            return
+        if not account_id:
+            logger.debug("Cuenta AWS desconocida: no se persiste el cache de List")
+            return
+        
+        services: Dict[str, Dict[str, Dict[str, List[Dict]]]] = {}
+        with self._cache_lock:
+            for (service, region), operations in self._list_results_cache.items():
+                services.setdefault(service, {})[region] = dict(operations)
+        
+        now = time.time()
+        data = {
+            account: entry
+            for account, entry in self._read_list_cache_file().items()
+            if isinstance(entry, dict)
+            and isinstance(entry.get("saved_at"), (int, float))
+            and now - entry["saved_at"] <= self.list_cache_ttl
+        }
+        data[account_id] = {"saved_at": now, "services": services}
+        
+        # Escribir a un temporal y reemplazar, para no dejar un cache a medio escribir
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump(data, f, default=str)
+            os.replace(tmp_path, path)
+            logger.info(f"Cache de List guardado en {path}")
+        except OSError as e:
+            logger.warning(f"No se pudo guardar el cache de List en {path}: {e}")
+    
+    def get_client(self, service_name: str, region: str) -> BaseClient:
+        """Obtener el cliente cacheado de (servicio, región), creándolo si no existe.
+        
+        Permite que otros componentes (p.ej. el descubrimiento de operaciones)
+        compartan los clientes del executor en lugar de crear los suyos.
+        """
+        return self._get_client(service_name, region)
+    
+    def prewarm(self, pairs: List[Tuple[str, str]]) -> int:
+        """Crear por adelantado los clientes de los (servicio, región) que se van a recolectar.
+        
+        Crear un cliente implica cargar y parsear el modelo JSON del servicio;
+        hacerlo al inicio evita pagar ese coste en la primera operación de cada
+        tarea. Se crean en el thread que llama porque Session.client no es
+        thread-safe. Devuelve el número de clientes disponibles.
+        """
+        ready = 0
+        for service_name, region in pairs:
+            try:
+                self._get_client(service_name, region)
+                ready += 1
+            except Exception as e:
+                logger.debug(f"No se pudo crear cliente {service_name} en {region}: {e}")
+        return ready
     
     def execute_operation(
         self,
@@ -196,6 +508,14 @@ class OperationExecutor:
     ) -> Optional[Dict]:
         """Ejecutar una operación AWS."""
         
+        if (service_name, region) in self._unavailable_endpoints:
+            return self._unavailable_endpoint_result(service_name, region)
+        
+        # Respetar el Retry-After de un throttling previo en el mismo servicio/región
+        wait = self._retry_after_wait(service_name, region)
+        if wait > 0:
+            time.sleep(wait)
+        
         # Si es safe-to-call, ejecutar directamente
         if operation_info.get("safe_to_call", False):
             return self._execute_safe_operation(
@@ -224,8 +544,9 @@ class OperationExecutor:
             # pero en realidad son opcionales
             try:
                 client = self._get_client(service_name, region)
-                if hasattr(client, operation_name):
-                    operation = getattr(client, operation_name)
+                method_name = self._resolve_method_name(client, service_name, operation_name)
+                if method_name is not None:
+                    operation = getattr(client, method_name)
                     # Intentar ejecutar sin parámetros
                     result = self._execute_with_retry(operation)
                     return {
@@ -256,21 +577,16 @@ class OperationExecutor:
         try:
             # Convertir nombre de operación de PascalCase a snake_case
             # Ejemplo: DescribeRegions -> describe_regions
-            # Intentar primero con el nombre original (por si ya está en snake_case)
-            method_name = operation_name
-            operation = getattr(client, method_name, None)
-            
-            # Si no existe, convertir a snake_case
-            if operation is None:
-                method_name = _pascal_to_snake(operation_name)
-                operation = getattr(client, method_name, None)
+            method_name = self._resolve_method_name(client, service_name, operation_name)
             
-            if operation is None:
+            if method_name is None:
                 # Operación no existe en el cliente - esto es normal, no es un error
                 # No guardamos estas operaciones para evitar ruido
-                logger.debug(f"Operación {operation_name} ({method_name}) no existe en cliente {service_name} (normal, no disponible)")
+                logger.debug(f"Operación {operation_name} no existe en cliente {service_name} (normal, no disponible)")
                 return None  # Retornar None para que no se guarde
             
+            operation = getattr(client, method_name)
+            
             # Verificar que es callable
             if not callable(operation):
                 logger.debug(f"Operación {operation_name} no es callable en {service_name}")
@@ -282,23 +598,19 @@ class OperationExecutor:
                     }
                 }
             
-            # Ejecutar con retry (usar method_name para paginación)
-            result = self._execute_with_retry(operation)
-            
-            # Si es paginada, obtener todas las páginas.
+            # Si es paginada, el paginator hace todas las llamadas (incluida la primera).
             # Pasamos operation_name (PascalCase original) para que el check de catálogo funcione.
             if operation_info.get("paginated", False):
                 result = self._paginate_operation(
-                    client, method_name, result, operation_info,
+                    client, method_name, operation, operation_info,
                     original_operation_name=operation_name
                 )
+            else:
+                result = self._execute_with_retry(operation)
             
             # Cachear resultados de List* para uso posterior
-            if operation_name.lower().startswith('list'):
-                cache_key = f"{service_name}:{region}:{operation_name}"
-                # Extraer items individuales de resultados paginados
-                items = self._extract_items_from_result(result)
-                self._list_results_cache[cache_key] = items
+            if operation_name[:4].lower() == 'list':
+                self._cache_list_items(service_name, region, operation_name, result)
             
             return {
                 "success": True,
@@ -306,24 +618,68 @@ class OperationExecutor:
                 "paginated": operation_info.get("paginated", False)
             }
         
-        except ClientError as e:
-            error_code = e.response.get('Error', {}).get('Code', 'Unknown')
+        except Exception as e:
+            _, error_result = self._classify_error(e, service_name, operation_name, region)
+            return error_result
+    
+    def _cache_list_items(
+        self,
+        service_name: str,
+        region: str,
+        operation_name: str,
+        result: Any
+    ) -> None:
+        """Guardar los items de una operación List para inferir parámetros después.
+        
+        De cada item solo se conservan los campos escalares, que son los únicos que
+        lee `_extract_id_from_item`: el resto de la respuesta (tags, estructuras
+        anidadas) se libera en cuanto se guarda el resultado, en lugar de quedar
+        retenido en el cache durante toda la ejecución.
+        """
+        # Extraer items individuales de resultados paginados
+        items = [
+            {key: value for key, value in item.items() if isinstance(value, (str, int))}
+            for item in self._extract_items_from_result(result)
+            if isinstance(item, dict)
+        ]
+        with self._cache_lock:
+            self._list_results_cache.setdefault(
+                (service_name, region), {}
+            )[operation_name] = items
+    
+    def _classify_error(
+        self,
+        error: Exception,
+        service_name: str,
+        operation_name: str,
+        region: Optional[str] = None
+    ) -> Tuple[str, Dict]:
+        """Clasificar una excepción de ejecución y construir el resultado fallido.
+        
+        Devuelve (código de error, resultado a guardar). Centraliza el logging por
+        categoría para todas las rutas de ejecución.
+        """
+        if isinstance(error, ClientError):
+            error_code = error.response.get('Error', {}).get('Code', 'Unknown')
+            category = _ERROR_CATEGORIES.get(error_code)
 
             # Errores esperados que no son críticos
-            if error_code in ['AccessDenied', 'UnauthorizedOperation']:
+            if category == "access_denied":
                 logger.debug(f"Acceso denegado: {service_name}.{operation_name}")
-                return {
+                return error_code, {
                     "success": False,
                     "error": {
                         "code": error_code,
-                        "message": str(e)
+                        "message": str(error)
                     }
                 }
 
-            # Throttling - retry ya manejado arriba
-            if error_code in ['Throttling', 'TooManyRequestsException']:
+            # Throttling - botocore ya agotó sus reintentos
+            if category == "throttling":
                 logger.warning(f"Throttling en {service_name}.{operation_name}")
-                return {
+                if region:
+                    self._note_retry_after(service_name, region, error)
+                return error_code, {
                     "success": False,
                     "error": {
                         "code": error_code,
@@ -332,13 +688,13 @@ class OperationExecutor:
                 }
 
             # Errores operacionales conocidos — condiciones de la cuenta, no del collector
-            if error_code in _KNOWN_OPERATIONAL_ERRORS:
+            if category == "operational":
                 descriptive_msg = _KNOWN_OPERATIONAL_ERRORS[error_code]
                 logger.debug(
                     f"Error operacional conocido en {service_name}.{operation_name}: "
                     f"{error_code} — {descriptive_msg}"
                 )
-                return {
+                return error_code, {
                     "success": False,
                     "error": {
                         "code": error_code,
@@ -349,92 +705,130 @@ class OperationExecutor:
 
             # Errores de parámetros — la operación requiere un recurso específico
             # (ID, ARN, nombre) que no pudo inferirse desde operaciones List previas.
-            if error_code in _PARAMETER_ERRORS:
-                logger.debug(
-                    f"Error de parámetros en {service_name}.{operation_name}: "
-                    f"{error_code} — operación requiere parámetros que no pudieron inferirse"
+            if category == "parameter":
+                return error_code, self._parameter_error_result(
+                    error_code, service_name, operation_name
                 )
-                return {
-                    "success": False,
-                    "error": {
-                        "code": error_code,
-                        "message": (
-                            f"Operación requiere parámetros obligatorios: {operation_name} necesita "
-                            f"un recurso específico (ID/ARN/nombre) que no pudo inferirse "
-                            f"automáticamente desde operaciones List previas."
-                        )
-                    },
-                    "parameter_error": True
-                }
 
             # Otros errores
             logger.debug(f"Error en {service_name}.{operation_name}: {error_code}")
-            return {
+            return error_code, {
                 "success": False,
                 "error": {
                     "code": error_code,
-                    "message": str(e)
+                    "message": str(error)
                 }
             }
-        
-        except AttributeError as e:
+
+        if isinstance(error, ParamValidationError):
+            # Validación local de botocore: faltan parámetros o el valor no es válido
+            return "ParamValidationError", self._parameter_error_result(
+                "ParamValidationError", service_name, operation_name
+            )
+
+        if isinstance(error, AttributeError):
             # Operación no existe en el cliente
-            logger.debug(f"Operación {operation_name} no disponible en {service_name}: {e}")
-            return {
+            logger.debug(f"Operación {operation_name} no disponible en {service_name}: {error}")
+            return "OperationNotFound", {
                 "success": False,
                 "error": {
                     "code": "OperationNotFound",
                     "message": f"Operation {operation_name} not available"
                 }
             }
-        except (EndpointConnectionError, ConnectTimeoutError, ReadTimeoutError, BotoConnectionError) as e:
+
+        error_str = str(error).lower()
+
+        if isinstance(error, (EndpointConnectionError, ConnectTimeoutError, ReadTimeoutError, BotoConnectionError)):
             # Errores de conexión - servicios no disponibles o endpoints no accesibles
             # Estos son esperados para algunos servicios/regiones
-            error_str = str(e).lower()
             if "could not connect" in error_str or "connect timeout" in error_str:
                 logger.debug(
                     f"Endpoint no disponible: {service_name}.{operation_name} "
                     f"(servicio puede no estar habilitado o región no soportada)"
                 )
             else:
-                logger.debug(f"Error de conexión en {service_name}.{operation_name}: {e}")
-            return {
+                logger.debug(f"Error de conexión en {service_name}.{operation_name}: {error}")
+            # Endpoint inexistente (DNS / conexión rechazada): no cambia durante la ejecución.
+            # Los timeouts pueden ser transitorios y no se recuerdan.
+            if region and isinstance(error, EndpointConnectionError):
+                with self._cache_lock:
+                    self._unavailable_endpoints.add((service_name, region))
+            return "EndpointNotAvailable", {
                 "success": False,
                 "error": {
                     "code": "EndpointNotAvailable",
-                    "message": str(e)
+                    "message": str(error)
                 },
                 "not_available": True  # Marcar como no disponible, no como error real
             }
-        except Exception as e:
-            # Categorizar otros errores esperados
-            error_str = str(e).lower()
-            
-            # Errores esperados que no deberían ser warnings
-            expected_errors = [
-                "unable to locate authorization token",  # CodeCatalyst
-                "has no attribute",
-                "operation not found",
-                "not implemented",
-                "service not available"
-            ]
-            
-            is_expected = any(expected in error_str for expected in expected_errors)
-            
-            if is_expected:
-                logger.debug(f"Error esperado en {service_name}.{operation_name}: {e}")
-            else:
-                # Solo loggear como warning si es realmente inesperado
-                logger.warning(f"Error inesperado en {service_name}.{operation_name}: {e}")
-            
-            return {
-                "success": False,
-                "error": {
-                    "code": "UnexpectedError",
-                    "message": str(e)
-                },
-                "not_available": is_expected  # Marcar como no disponible si es esperado
-            }
+
+        # Categorizar otros errores esperados
+        is_expected = _EXPECTED_ERROR_RE.search(error_str) is not None
+        
+        if is_expected:
+            logger.debug(f"Error esperado en {service_name}.{operation_name}: {error}")
+        else:
+            # Solo loggear como warning si es realmente inesperado
+            logger.warning(f"Error inesperado en {service_name}.{operation_name}: {error}")
+        
+        return "UnexpectedError", {
+            "success": False,
+            "error": {
+                "code": "UnexpectedError",
+                "message": str(error)
+            },
+            "not_available": is_expected  # Marcar como no disponible si es esperado
+        }
+    
+    def _unavailable_endpoint_result(self, service_name: str, region: str) -> Dict:
+        """Resultado para un (servicio, región) cuyo endpoint ya se sabe no disponible."""
+        logger.debug(f"Endpoint {service_name} en {region} ya marcado como no disponible; se omite")
+        return {
+            "success": False,
+            "error": {
+                "code": "EndpointNotAvailable",
+                "message": f"Endpoint for {service_name} not available in {region}"
+            },
+            "not_available": True
+        }
+    
+    def _note_retry_after(self, service_name: str, region: str, error: ClientError) -> None:
+        """Registrar la espera pedida por el servicio (Retry-After) tras un throttling."""
+        delay = _retry_after_seconds(error)
+        if not delay:
+            return
+        until = time.monotonic() + delay
+        with self._cache_lock:
+            key = (service_name, region)
+            self._throttled_until[key] = max(until, self._throttled_until.get(key, 0.0))
+        logger.debug(f"{service_name}/{region}: el servicio pide esperar {delay:.1f}s (Retry-After)")
+    
+    def _retry_after_wait(self, service_name: str, region: str) -> float:
+        """Segundos que faltan para poder volver a llamar a (servicio, región)."""
+        until = self._throttled_until.get((service_name, region))
+        if until is None:
+            return 0.0
+        return max(0.0, until - time.monotonic())
+    
+    def _parameter_error_result(self, error_code: str, service_name: str, operation_name: str) -> Dict:
+        """Resultado para operaciones que requieren parámetros que no pudieron inferirse."""
+        logger.debug(
+            f"Error de parámetros en {service_name}.{operation_name}: "
+            f"{error_code} — operación requiere parámetros que no pudieron inferirse"
+        )
+        return {
+            "success": False,
+            "error": {
+                "code": error_code,
+                "message": (
+                    f"Operación requiere parámetros obligatorios: {operation_name} necesita "
+                    f"un recurso específico (ID/ARN/nombre) que no pudo inferirse "
+                    f"automáticamente desde operaciones List previas."
+                )
+            },
+            "parameter_error": True
+        }
     
     def _execute_with_inferred_params(
         self,
@@ -449,30 +843,7 @@ class OperationExecutor:
             return None
         
         param_name = required_params[0]["name"]
-        
-        # Buscar en cache de List operations
-        cache_key = f"{service_name}:{region}:list*"
-        
-        # Buscar cualquier List operation del mismo servicio
-        matching_keys = [
-            k for k in self._list_results_cache.keys()
-            if k.startswith(f"{service_name}:{region}:list")
-        ]
-        
-        if not matching_keys:
-            logger.debug(f"No hay datos de List para inferir {param_name} en {operation_name}")
-            return None
-        
-        # Intentar extraer IDs desde resultados de List
-        inferred_values = []
-        for cache_key in matching_keys[:self.max_followups]:  # Limitar followups
-            list_results = self._list_results_cache[cache_key]
-            for item in list_results:
-                # Heurísticas comunes para extraer IDs
-                id_value = self._extract_id_from_item(item, param_name, service_name)
-                if id_value:
-                    inferred_values.append(id_value)
-        
+        inferred_values = self._infer_param_values(service_name, region, operation_name, param_name)
         if not inferred_values:
             return None
         
@@ -480,19 +851,15 @@ class OperationExecutor:
         client = self._get_client(service_name, region)
         results = []
         
-        # Convertir nombre de operación a snake_case
-        method_name = _pascal_to_snake(operation_name)
+        # Verificar que la operación existe (resuelto una vez por servicio/operación)
+        method_name = self._resolve_method_name(client, service_name, operation_name)
+        if method_name is None:
+            logger.debug(f"Operación {operation_name} no disponible en cliente {service_name}")
+            return None
+        operation = getattr(client, method_name)
         
         for value in inferred_values[:self.max_followups]:
             try:
-                # Verificar que la operación existe (intentar ambos formatos)
-                operation = getattr(client, method_name, None)
-                if operation is None:
-                    operation = getattr(client, operation_name, None)
-                
-                if operation is None:
-                    logger.debug(f"Operación {operation_name} ({method_name}) no disponible en cliente {service_name}")
-                    break
                 result = self._execute_with_retry(
                     operation,
                     **{param_name: value}
@@ -502,7 +869,8 @@ class OperationExecutor:
                 logger.debug(f"Operación {operation_name} no disponible en {service_name}")
                 break
             except Exception as e:
-                logger.debug(f"Error con parámetro inferido {param_name}={value}: {e}")
+                error_code, _ = self._classify_error(e, service_name, operation_name, region)
+                logger.debug(f"Error con parámetro inferido {param_name}={value}: {error_code}")
                 continue
         
         if results:
@@ -515,35 +883,92 @@ class OperationExecutor:
         
         return None
     
-    def _extract_items_from_result(self, result: Dict) -> List[Dict]:
-        """Extraer items individuales de un resultado (puede ser paginado o no)."""
+    def _infer_param_values(
+        self,
+        service_name: str,
+        region: str,
+        operation_name: str,
+        param_name: str
+    ) -> List[str]:
+        """Valores candidatos para `param_name`, extraídos de las List del servicio."""
+        # Buscar cualquier List operation del mismo servicio y región
+        with self._cache_lock:
+            list_caches = list(
+                self._list_results_cache.get((service_name, region), {}).values()
+            )[:self.max_followups]  # Limitar followups
+        
+        if not list_caches:
+            logger.debug(f"No hay datos de List para inferir {param_name} en {operation_name}")
+            return []
+        
+        # Intentar extraer IDs desde resultados de List
+        inferred_values = []
+        for list_results in list_caches:
+            for item in list_results:
+                # Heurísticas comunes para extraer IDs
+                id_value = self._extract_id_from_item(item, param_name, service_name)
+                # Descartar candidatos con formato imposible: solo generarían llamadas fallidas
+                if id_value and _is_plausible_param_value(service_name, param_name, id_value):
+                    inferred_values.append(id_value)
+        
+        # El mismo ID puede aparecer en varios List del servicio: una llamada por valor
+        inferred_values = list(dict.fromkeys(inferred_values))
+        if not inferred_values:
+            logger.debug(f"Sin valores válidos para {param_name} en {service_name}.{operation_name}")
+        return inferred_values
+    
+    def _resolve_method_name(
+        self,
+        client: BaseClient,
+        service_name: str,
+        operation_name: str
+    ) -> Optional[str]:
+        """Resolver el método del cliente para una operación (PascalCase o snake_case).
+        
+        Se consulta el modelo del servicio (`method_to_api_mapping`) en lugar de
+        probar atributos del cliente, que dispara la generación dinámica de métodos
+        de botocore. El mapa se cachea por servicio: los clientes de un mismo
+        servicio exponen los mismos métodos en todas las regiones. Devuelve None si
+        la operación no existe.
+        """
+        methods = self._method_cache.get(service_name)
+        if methods is None:
+            mapping = client.meta.method_to_api_mapping
+            methods = {api_name: method for method, api_name in mapping.items()}
+            methods.update((method, method) for method in mapping)
+            methods = self._method_cache.setdefault(service_name, methods)
+        return methods.get(operation_name)
+    
+    def _extract_items_from_result(self, result: Any) -> List[Dict]:
+        """Extraer items individuales de un resultado (puede ser paginado o no).
+        
+        Acepta la salida de `_paginate_operation` ({"pages", "data"}), una respuesta
+        simple (dict) o cualquier iterable de páginas, como el de `_iter_pages`.
+        """
         items = []
-        data = result.get("data", {})
-        
-        # Si es paginado, extraer items de cada página
-        if isinstance(data, dict) and "data" in data and "pages" in data:
-            pages = data.get("data", [])
-            for page in pages:
-                if isinstance(page, dict):
-                    # Buscar listas comunes de items
-                    for key in ["HostedZones", "HostedZoneSummaries", "Items", "Results", "Values"]:
-                        if key in page and isinstance(page[key], list):
-                            items.extend(page[key])
-                    # Si no hay lista, el page mismo puede ser un item
-                    if not any(key in page for key in ["HostedZones", "HostedZoneSummaries", "Items", "Results", "Values"]):
-                        items.append(page)
-        # Si no es paginado pero tiene estructura de lista
-        elif isinstance(data, dict):
-            # Buscar listas comunes de items
-            for key in ["HostedZones", "HostedZoneSummaries", "Items", "Results", "Values"]:
-                if key in data and isinstance(data[key], list):
-                    items.extend(data[key])
-            # Si no hay lista, el data mismo puede ser un item
-            if not items and data:
-                items.append(data)
-        # Si data es una lista directamente
-        elif isinstance(data, list):
-            items = data
+        
+        if isinstance(result, dict):
+            if "pages" in result and isinstance(result.get("data"), list):
+                # Paginado: una entrada por página
+                pages = result["data"]
+            else:
+                # Respuesta simple: una sola página
+                pages = (result,)
+        elif result is None:
+            pages = ()
+        else:
+            pages = result
+        
+        for page in pages:
+            if isinstance(page, dict):
+                # Buscar listas comunes de items
+                found = page.keys() & _ITEM_KEYS
+                for key in found:
+                    if isinstance(page[key], list):
+                        items.extend(page[key])
+                # Si no hay lista, el page mismo puede ser un item
+                if not found:
+                    items.append(page)
         
         return items
     
@@ -552,105 +977,36 @@ class OperationExecutor:
         if not isinstance(item, dict):
             return None
         
-        # Buscar directamente
-        if param_name in item:
-            value = item[param_name]
+        # Una intersección de claves descarta de golpe los items sin ningún candidato
+        present = item.keys() & _id_key_set(param_name)
+        if not present:
+            return None
+        
+        # Buscar directamente y luego con heurísticas comunes (Id, Arn, ...)
+        for key, is_hosted_zone in _id_key_variants(param_name):
+            if key not in present:
+                continue
+            value = item[key]
             if isinstance(value, (str, int)):
                 value_str = str(value)
                 # Lógica específica para Route 53: el HostedZoneId puede venir con formato /hostedzone/Z1234567890
-                if service_name == "route53" and param_name.lower() in ["hostedzoneid", "hostedzone"]:
-                    if "/hostedzone/" in value_str:
-                        # Extraer solo el ID después de /hostedzone/
-                        value_str = value_str.split("/hostedzone/")[-1]
-                    return value_str
+                if service_name == "route53" and is_hosted_zone:
+                    # Extraer solo el ID después de /hostedzone/ (sin cambios si no aparece)
+                    value_str = value_str.rpartition("/hostedzone/")[2]
                 return value_str
         
-        # Heurísticas comunes
-        id_variants = [
-            param_name,
-            f"{param_name}Id",
-            f"{param_name}_id",
-            "Id",
-            "ID",
-            "id",
-            "Arn",
-            "ARN",
-            "arn"
-        ]
-        
-        for variant in id_variants:
-            if variant in item:
-                value = item[variant]
-                if isinstance(value, (str, int)):
-                    value_str = str(value)
-                    # Lógica específica para Route 53
-                    if service_name == "route53" and "hostedzone" in variant.lower():
-                        if "/hostedzone/" in value_str:
-                            value_str = value_str.split("/hostedzone/")[-1]
-                        return value_str
-                    return value_str
-        
         return None
     
     def _execute_with_retry(self, operation, **kwargs) -> Any:
-        """Ejecutar operación con retry, backoff exponencial + jitter, y timeout global."""
-        max_retries = 3
-        base_delay = 0.5
-
-        start_time = time.time()
-
-        for attempt in range(max_retries):
-            try:
-                elapsed = time.time() - start_time
-                if elapsed > self.operation_timeout:
-                    raise TimeoutError(f"Operación excedió timeout de {self.operation_timeout}s")
-
-                result = operation(**kwargs)
-
-                elapsed = time.time() - start_time
-                if elapsed > self.operation_timeout:
-                    logger.warning(f"Operación completó pero excedió timeout de {self.operation_timeout}s")
-
-                return result
-
-            except ClientError as e:
-                error_code = e.response.get('Error', {}).get('Code', '')
-
-                if error_code in (
-                    'Throttling', 'ThrottlingException', 'TooManyRequestsException',
-                    'RequestLimitExceeded', 'SlowDown', 'ServiceUnavailable',
-                    'RequestThrottled',
-                ):
-                    if attempt < max_retries - 1:
-                        # Backoff exponencial con jitter completo (full jitter) para evitar
-                        # thundering herd cuando varios threads reintentan a la vez.
-                        cap = base_delay * (2 ** attempt) * 4
-                        delay = random.uniform(base_delay, cap)
-                        logger.debug(
-                            f"Throttling, retry en {delay:.2f}s "
-                            f"(intento {attempt + 1}/{max_retries})"
-                        )
-                        time.sleep(delay)
-                        continue
-                # Otros errores ClientError — no retry
-                raise
-
-            except (EndpointConnectionError, ConnectTimeoutError, ReadTimeoutError,
-                    BotoConnectionError, TimeoutError):
-                # Errores de conectividad o timeout — no reintentar
-                raise
-
-            except Exception as e:
-                elapsed = time.time() - start_time
-                if elapsed > self.operation_timeout:
-                    logger.warning(
-                        f"Operación falló después de {elapsed:.1f}s "
-                        f"(timeout: {self.operation_timeout}s)"
-                    )
-                    raise TimeoutError(f"Operación excedió timeout de {self.operation_timeout}s")
-                raise
-
-        raise Exception("Max retries exceeded")
+        """Ejecutar una llamada a la API.
+        
+        Los reintentos por throttling los gestiona botocore en modo adaptive
+        (ver `_client_config`): backoff con jitter y rate limiting del lado cliente.
+        Los timeouts también: connect/read timeout del cliente, con el read timeout
+        acotado por `operation_timeout`, así el socket se corta en vez de medir el
+        tiempo transcurrido después de la llamada.
+        """
+        return _strip_response_metadata(operation(**kwargs))
     
     # Operaciones con catálogos muy grandes o historiales: 1 página es suficiente.
     # El diagnóstico Well-Architected no necesita el catálogo completo de precios/reservas.
@@ -714,7 +1070,7 @@ class OperationExecutor:
         self,
         client: BaseClient,
         operation_name: str,
-        first_result: Any,
+        operation: Any,
         operation_info: Dict,
         original_operation_name: str = "",
     ) -> Dict:
@@ -723,27 +1079,55 @@ class OperationExecutor:
         `operation_name` puede ser snake_case (para el paginator de boto3).
         `original_operation_name` es el nombre PascalCase original; se usa para
         determinar si la operación es un catálogo.
+        
+        El resultado se guarda como un único documento JSON, así que aquí se
+        materializan las páginas; quien solo necesite recorrerlas puede usar
+        `_iter_pages` directamente.
         """
-        all_data = []
+        all_data = list(self._iter_pages(
+            client, operation_name, operation,
+            original_operation_name=original_operation_name
+        ))
 
-        if isinstance(first_result, dict):
-            all_data.append(first_result)
-        else:
-            all_data.append({"result": first_result})
+        return {
+            "pages": len(all_data),
+            "data": all_data
+        }
+    
+    def _iter_pages(
+        self,
+        client: BaseClient,
+        operation_name: str,
+        operation: Any,
+        original_operation_name: str = "",
+    ) -> Iterator[Dict]:
+        """Generar las páginas de una operación paginada bajo demanda.
+        
+        Todas las páginas, incluida la primera, las pide el paginator a medida que
+        se consumen, respetando el límite de páginas. Si la operación no tiene
+        paginator, se hace una única llamada a `operation`. Un error en la primera
+        página se propaga; en las siguientes se conservan las páginas obtenidas.
+        """
+        check_name, is_catalog, page_limit = self._page_limit(operation_name, original_operation_name)
 
-        # Verificar con ambas formas del nombre para robustez
-        check_name = original_operation_name or operation_name
-        is_catalog = check_name in self._CATALOG_OPERATIONS or operation_name in self._CATALOG_OPERATIONS
-        page_limit = self._MAX_PAGES_CATALOG if is_catalog else self.max_pages
+        paginator = self._get_paginator(client, operation_name)
+        if paginator is None:
+            logger.debug(f"No hay paginator para {operation_name}, usando una sola llamada")
+            result = self._execute_with_retry(operation)
+            yield result if isinstance(result, dict) else {"result": result}
+            return
 
+        page_count = 0
         try:
-            paginator = client.get_paginator(operation_name)
-            page_iterator = paginator.paginate()
+            page_iterator = self._paginate_with_page_size(
+                paginator,
+                client.meta.service_model.service_name,
+                operation_name,
+                page_limit,
+            )
 
-            page_count = 0
             for page in page_iterator:
-                # Ya tenemos la primera página (first_result); sumamos desde ahí.
-                if page_count >= page_limit - 1:
+                if page_count >= page_limit:
                     if is_catalog:
                         logger.debug(
                             f"Catálogo limitado a {page_limit} páginas para {check_name}"
@@ -751,31 +1135,107 @@ class OperationExecutor:
                     else:
                         logger.warning(f"Límite de páginas alcanzado para {check_name}")
                     break
-                all_data.append(page)
+                yield _strip_response_metadata(page)
                 page_count += 1
 
-        except Exception:
-            logger.debug(f"No hay paginator para {operation_name}, usando resultado inicial")
-
-        return {
-            "pages": len(all_data),
-            "data": all_data
-        }
+        except Exception as e:
+            if page_count == 0:
+                raise
+            logger.debug(f"Error paginando {operation_name}: {e}; se conservan las páginas obtenidas")
+    
+    def _page_limit(
+        self,
+        operation_name: str,
+        original_operation_name: str = ""
+    ) -> Tuple[str, bool, int]:
+        """Nombre para logs, si es catálogo y límite de páginas de una operación."""
+        # Verificar con ambas formas del nombre para robustez
+        check_name = original_operation_name or operation_name
+        is_catalog = check_name in self._CATALOG_OPERATIONS or operation_name in self._CATALOG_OPERATIONS
+        page_limit = self._MAX_PAGES_CATALOG if is_catalog else self.max_pages
+        return check_name, is_catalog, page_limit
+    
+    def _get_paginator(self, client: BaseClient, operation_name: str) -> Optional[Any]:
+        """Obtener el paginator de una operación desde cache (None si no es paginable).
+        
+        Los paginators no guardan estado de iteración (cada `paginate()` crea su
+        propio PageIterator), así que se reutilizan por (cliente, operación).
+        """
+        cache_key = (id(client), operation_name)
+        try:
+            return self._paginator_cache[cache_key]
+        except KeyError:
+            pass
+        
+        paginator = None
+        if client.can_paginate(operation_name):
+            paginator = client.get_paginator(operation_name)
+        return self._paginator_cache.setdefault(cache_key, paginator)
+    
+    def _paginate_with_page_size(
+        self,
+        paginator: Any,
+        service_name: str,
+        operation_name: str,
+        page_limit: int,
+    ) -> Iterator[Dict]:
+        """Recorrer un paginator usando un PageSize mayor cuando la API lo admite.
+        
+        Si el servicio rechaza el tamaño de página como parámetro inválido, se
+        vuelve a la paginación por defecto.
+        """
+        page_size = _PAGE_SIZE_OVERRIDES.get((service_name, operation_name))
+        if page_size:
+            pagination_config = {"PageSize": page_size, "MaxItems": page_limit * page_size}
+            pages = iter(paginator.paginate(PaginationConfig=pagination_config))
+            try:
+                first_page = next(pages)
+            except StopIteration:
+                return
+            except ParamValidationError as e:
+                logger.debug(f"PageSize {page_size} no válido para {service_name}.{operation_name}: {e}")
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') not in _PARAMETER_ERRORS:
+                    raise
+                logger.debug(f"PageSize {page_size} rechazado por {service_name}.{operation_name}: {e}")
+            else:
+                yield first_page
+                yield from pages
+                return
+        
+        yield from paginator.paginate()
     
     def _get_client(self, service_name: str, region: str) -> BaseClient:
         """Obtener cliente AWS desde cache o crear nuevo con timeouts configurados."""
         cache_key = f"{service_name}:{region}"
-        if cache_key not in self._client_cache:
-            # Configurar timeouts para evitar operaciones que se cuelguen
-            config = Config(
-                connect_timeout=self.connect_timeout,
-                read_timeout=self.read_timeout,
-                retries={'max_attempts': 2}  # Reducir retries para evitar esperas largas
-            )
-            self._client_cache[cache_key] = self.session.client(
-                service_name,
-                region_name=region,
-                config=config
-            )
-        return self._client_cache[cache_key]
-
+        client = self._client_cache.get(cache_key)
+        if client is not None:
+            return client
+        
+        # Session.client no es thread-safe: la creación se serializa bajo el lock
+        # (normalmente ya los ha creado prewarm y aquí solo hay aciertos de cache)
+        with self._client_lock:
+            client = self._client_cache.get(cache_key)
+            if client is None:
+                client = self.session.client(
+                    service_name,
+                    region_name=region,
+                    config=self._client_config()
+                )
+                self._client_cache[cache_key] = client
+            return client
+    
+    def _client_config(self) -> Config:
+        """Configuración común de los clientes boto3."""
+        # Configurar timeouts para evitar operaciones que se cuelguen
+        return Config(
+            connect_timeout=self.connect_timeout,
+            # Una lectura nunca puede esperar más que la operación completa
+            read_timeout=min(self.read_timeout, self.operation_timeout),
+            max_pool_connections=self.max_pool_connections,
+            # Mantener vivas las conexiones del pool para reutilizar TCP/TLS entre llamadas
+            tcp_keepalive=True,
+            # Reintentos gestionados por botocore: el modo adaptive coordina backoff y
+            # rate limiting entre todas las llamadas del cliente ante throttling.
+            retries={'max_attempts': _MAX_ATTEMPTS, 'mode': 'adaptive'}
+        )
@@ -7,23 +7,35 @@ guardando los resultados en formato JSON comprimido.
 """
 
 import argparse
+import itertools
 import json
-import gzip
+import math
 import os
+import queue
 import sys
 import time
 import threading
-from datetime import datetime
+import zlib
+from collections import Counter
+from datetime import date, datetime, time as dt_time, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
 import boto3
+from botocore.config import Config
+from botocore.credentials import CredentialProvider, RefreshableCredentials
+from botocore.session import get_session as get_botocore_session
 from botocore.exceptions import ClientError, EndpointConnectionError
 from botocore.model import OperationModel
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:  # opcional: sin orjson se usa json de la librería estándar
+    orjson = None
+
 from collector.discovery import ServiceDiscovery
 from collector.executor import OperationExecutor
 from collector.metadata import MetadataCollector
@@ -44,6 +56,161 @@ DEFAULT_MAX_OPS_PER_SERVICE = 80
 DEFAULT_CONNECT_TIMEOUT = 15
 DEFAULT_READ_TIMEOUT = 45
 DEFAULT_OPERATION_TIMEOUT = 120
+DEFAULT_LIST_CACHE_TTL = 3600
+# Threads dedicados a serializar y comprimir resultados
+DEFAULT_WRITER_THREADS = 2
+# Threads de la fase de descubrimiento de operaciones (previa a la ejecución)
+DEFAULT_DISCOVERY_THREADS = 8
+# Compresión rápida de resultados: en JSON el ratio apenas mejora con niveles altos
+# y el coste de CPU se multiplica
+RESULT_GZIP_LEVEL = 1
+# Buffer del archivo de salida: el stream comprimido se escribe en bloques grandes
+RESULT_WRITE_BUFFER = 64 * 1024
+# Niveles del resultado que se emiten por partes al comprimir:
+# resultado -> "data" -> páginas/resultados; cada página se serializa y comprime por separado
+RESULT_STREAM_DEPTH = 3
+# Operaciones fallidas sin datos: una línea por operación en raw/{service}/{region}/, en vez
+# de un archivo por operación (el indexer del analyzer las lee de aquí)
+ERRORS_FILENAME = "_errors.jsonl.gz"
+# Cuota de CPU del contenedor (cgroup v2 y v1) para dimensionar los threads por defecto
+_CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+_CGROUP_V1_CPU_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+_CGROUP_V1_CPU_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+
+
+def _json_default(value):
+    """Valores no serializables: fechas en ISO 8601 (igual que orjson), el resto como str."""
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    return str(value)
+
+
+def _dumps_json(obj, indent: Optional[int] = None) -> bytes:
+    """Serializar a JSON (UTF-8) con orjson si está instalado, o con json estándar.
+    
+    Ambos caminos escriben las fechas en ISO 8601. orjson solo indenta a 2 espacios:
+    cualquier otra indentación se delega en json estándar.
+    """
+    if orjson is not None and indent in (None, 2):
+        # orjson serializa datetime de forma nativa (ISO 8601); _json_default cubre el resto
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=_json_default, option=option)
+        except orjson.JSONEncodeError as e:
+            # p.ej. enteros fuera de 64 bits: json estándar sí los soporta
+            logger.debug(f"orjson no pudo serializar, usando json estándar: {e}")
+    # Sin indentación, compacto igual que orjson: sin espacios tras ',' y ':'
+    separators = (",", ":") if indent is None else None
+    return json.dumps(obj, indent=indent, separators=separators, default=_json_default).encode('utf-8')
+
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    """CPUs permitidas por la cuota de cgroup (v2 cpu.max o v1 cfs), o None si no hay cuota."""
+    try:
+        with open(_CGROUP_V2_CPU_MAX) as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        with open(_CGROUP_V1_CPU_QUOTA) as f:
+            quota = int(f.read())
+        with open(_CGROUP_V1_CPU_PERIOD) as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _default_max_threads() -> int:
+    """Threads por defecto según las CPUs disponibles para el proceso.
+    
+    Cuenta las CPUs de la afinidad del proceso, acotadas por la cuota de CPU del
+    cgroup (la que aplican EKS/Fargate/Docker con --cpus). La recolección es de I/O
+    (4 threads por CPU), pero el techo sigue siendo DEFAULT_MAX_THREADS: en hosts
+    grandes el límite real es el throttling de AWS.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # sched_getaffinity solo existe en Linux
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_limit()
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return max(1, min(DEFAULT_MAX_THREADS, 4 * cpus))
+
+
+def _write_json_atomic(path: Path, obj) -> None:
+    """Escribir JSON indentado vía archivo temporal + os.replace (nunca queda a medias)."""
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(_dumps_json(obj, indent=2))
+    os.replace(tmp_path, path)
+
+
+def _iter_json_chunks(value, depth: int) -> Iterator[bytes]:
+    """Serializar a JSON compacto en fragmentos, abriendo dicts y listas hasta `depth` niveles."""
+    if depth > 0 and isinstance(value, dict) and value:
+        sep = b'{'
+        for key, item in value.items():
+            yield sep + _dumps_json(str(key)) + b':'
+            sep = b','
+            yield from _iter_json_chunks(item, depth - 1)
+        yield b'}'
+    elif depth > 0 and isinstance(value, list) and value:
+        sep = b'['
+        for item in value:
+            yield sep
+            sep = b','
+            yield from _iter_json_chunks(item, depth - 1)
+        yield b']'
+    else:
+        yield _dumps_json(value)
+
+
+# Operaciones de inventario real y señales de alto valor que se ejecutan primero, por
+# servicio, para que no queden fuera por timeout en servicios muy grandes (ej. ec2)
+_PRIORITY_OPERATIONS: Dict[str, Tuple[str, ...]] = {
+    "ec2": (
+        "DescribeInstances",
+        "DescribeVolumes",
+        "DescribeSnapshots",
+        "DescribeVpcs",
+        "DescribeSubnets",
+        "DescribeSecurityGroups",
+        "DescribeNetworkInterfaces",
+        "DescribeRouteTables",
+        "DescribeInternetGateways",
+        "DescribeNatGateways",
+        "DescribeAddresses",
+        "DescribeLaunchTemplates",
+    ),
+    "rds": (
+        "DescribeDBInstances",
+        "DescribeDBClusters",
+        "DescribeDBSnapshots",
+        "DescribeDBClusterSnapshots",
+        "DescribeDBSubnetGroups",
+        "DescribeDBParameterGroups",
+        "DescribeOptionGroups",
+    ),
+    "s3": ("ListBuckets",),
+    "lambda": ("ListFunctions",),
+    "dynamodb": ("ListTables",),
+    "iam": ("ListUsers", "ListRoles", "ListPolicies", "ListGroups"),
+    "ecs": ("ListClusters", "ListServices", "ListTasks"),
+    "eks": ("ListClusters", "ListNodegroups"),
+}
+_PRIORITY_OPERATION_SETS: Dict[str, frozenset] = {
+    service: frozenset(names) for service, names in _PRIORITY_OPERATIONS.items()
+}
 
 # Servicios globales de AWS: no tienen endpoint por región — se consultan solo en us-east-1
 # para evitar duplicados y errores de endpoint en regiones que no los soportan.
@@ -126,6 +293,19 @@ _DEFAULT_SOFT_DENYLIST = frozenset({
 })
 
 
+class _StaticCredentialProvider(CredentialProvider):
+    """Proveedor que entrega unas credenciales ya construidas (p.ej. AssumeRole renovable)."""
+    
+    METHOD = 'sts-assume-role'
+    
+    def __init__(self, credentials: RefreshableCredentials):
+        super().__init__()
+        self._credentials = credentials
+    
+    def load(self) -> RefreshableCredentials:
+        return self._credentials
+
+
 class Collector:
     """Coordinador principal de recolección de datos AWS."""
     
@@ -143,14 +323,16 @@ class Collector:
         max_service_seconds: int = 90,
         max_ops_per_service: int = DEFAULT_MAX_OPS_PER_SERVICE,
         include_nonsafe_ops: bool = False,
+        pretty_json: bool = False,
     ):
         self.output_dir = Path(output_dir)
         self.raw_dir = self.output_dir / "raw"
         self.raw_dir.mkdir(parents=True, exist_ok=True)
+        # Rutas de resultados como str (os.path.join): se arman una vez por operación
+        self._raw_dir_str = str(self.raw_dir)
         
         self.role_arn = role_arn or os.getenv("AWS_ROLE_ARN")
         self.external_id = external_id or os.getenv("AWS_EXTERNAL_ID")
-        self.regions = regions or self._get_regions()
         self.max_threads = max_threads
         self.max_pages = max_pages
         self.max_followups = max_followups
@@ -168,6 +350,8 @@ class Collector:
         
         # Estadísticas — protegidas con lock para uso seguro en múltiples threads
         self._stats_lock = threading.Lock()
+        # Inicio de collect(), para elapsed_seconds (también en flush_stats tras interrupción)
+        self._start_time: Optional[float] = None
         self.stats = {
             "services_discovered": 0,
             "operations_executed": 0,
@@ -178,28 +362,68 @@ class Collector:
             "parameter_errors": 0,
             "errors": []
         }
-        # Cache para saltarse rápido servicios cuyo endpoint no está disponible en una región
+        # Cache para saltarse rápido servicios cuyo endpoint no está disponible en una región.
+        # Solo crece: `in` y `add` sobre un set son atómicos con el GIL, no necesita lock.
         self._unavailable_endpoints: Set[str] = set()  # "{service}:{region}"
-        self._unavailable_lock = threading.Lock()
-        
-        # Inicializar sesión AWS
-        self.session = self._create_session()
+        # Cola de escritura de resultados (activa solo durante collect()): los threads de
+        # recolección encolan y vuelven a llamar a AWS mientras otros threads comprimen.
+        self._save_queue: Optional[queue.Queue] = None
+        self._writer_threads: List[threading.Thread] = []
+        # Serializa los append a raw/{service}/{region}/_errors.jsonl.gz entre writers
+        self._errors_lock = threading.Lock()
+        # Directorios de raw/ ya creados: evita un mkdir (stat + mkdir) por cada resultado
+        self._created_dirs: Set[str] = set()
+        self._created_dirs_lock = threading.Lock()
+        # Timestamp ISO de los resultados con resolución de segundos: (segundo, iso).
+        # Se reemplaza como tupla completa, así que los threads nunca leen un par mezclado.
+        self._timestamp_cache = (0, "")
+        # Plan de operaciones por servicio (ver _plan_operations), compartido entre regiones
+        self._operation_plans: Dict[str, Tuple[List[tuple], int]] = {}
+        # JSON compacto por defecto (más rápido de serializar y comprimir);
+        # --pretty / ECAD_PRETTY_JSON=1 guarda los resultados indentados para inspección manual
+        self.json_indent: Optional[int] = 2 if pretty_json else None
         
-        # Componentes
-        self.discovery = ServiceDiscovery(self.session)
         # Configurar timeouts para evitar operaciones que se cuelguen
         connect_timeout = int(os.getenv("ECAD_CONNECT_TIMEOUT", str(DEFAULT_CONNECT_TIMEOUT)))
         read_timeout = int(os.getenv("ECAD_READ_TIMEOUT", str(DEFAULT_READ_TIMEOUT)))
         operation_timeout = int(os.getenv("ECAD_OPERATION_TIMEOUT", str(DEFAULT_OPERATION_TIMEOUT)))
+        # Configuración común de todos los clientes: pool dimensionado para los threads,
+        # keepalive TCP y reintentos adaptive de botocore ante throttling
+        self.boto_config = Config(
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            max_pool_connections=max(50, self.max_threads * 2),
+            tcp_keepalive=True,
+            retries={'mode': 'adaptive', 'max_attempts': 5}
+        )
+        
+        # Inicializar sesión AWS (sus clientes auxiliares ya usan boto_config)
+        self.session = self._create_session()
+        # Regiones: con AWS_REGIONS=all se consultan con la sesión ya creada
+        self.regions = regions or self._get_regions()
+        
+        # Componentes
+        # Cache de resultados List entre ejecuciones (desactivado si no se indica ruta)
+        list_cache_path = os.getenv("ECAD_LIST_CACHE_PATH") or None
+        list_cache_ttl = int(os.getenv("ECAD_LIST_CACHE_TTL", str(DEFAULT_LIST_CACHE_TTL)))
         self.executor = OperationExecutor(
             self.session,
             max_pages=max_pages,
             max_followups=max_followups,
             connect_timeout=connect_timeout,
             read_timeout=read_timeout,
-            operation_timeout=operation_timeout
+            operation_timeout=operation_timeout,
+            max_pool_connections=self.boto_config.max_pool_connections,
+            list_cache_path=list_cache_path,
+            list_cache_ttl=list_cache_ttl
         )
-        self.metadata_collector = MetadataCollector(self.session)
+        # Discovery usa los clientes cacheados del executor: un solo cliente por (servicio, región)
+        self.discovery = ServiceDiscovery(
+            self.session,
+            config=self.boto_config,
+            client_factory=self.executor.get_client
+        )
+        self.metadata_collector = MetadataCollector(self.session, config=self.boto_config)
     
     def _get_regions(self) -> List[str]:
         """Obtener lista de regiones desde variable de entorno o usar default."""
@@ -208,7 +432,7 @@ class Collector:
             if env_regions.lower() == "all":
                 # Obtener todas las regiones disponibles
                 try:
-                    ec2 = self.session.client('ec2', region_name='us-east-1')
+                    ec2 = self.session.client('ec2', region_name='us-east-1', config=self.boto_config)
                     regions_response = ec2.describe_regions()
                     all_regions = [r['RegionName'] for r in regions_response.get('Regions', [])]
                     logger.info(f"Usando todas las regiones disponibles: {len(all_regions)} regiones")
@@ -236,7 +460,7 @@ class Collector:
             else:
                 initial_session = boto3.Session()
             
-            sts = initial_session.client('sts')
+            sts = initial_session.client('sts', config=self.boto_config)
             assume_role_kwargs = {
                 "RoleArn": self.role_arn,
                 "RoleSessionName": os.getenv("AWS_ROLE_SESSION_NAME", "ECAD-Session")
@@ -244,14 +468,28 @@ class Collector:
             if self.external_id:
                 assume_role_kwargs["ExternalId"] = self.external_id
             
-            response = sts.assume_role(**assume_role_kwargs)
-            credentials = response['Credentials']
+            def refresh_credentials() -> Dict[str, str]:
+                credentials = sts.assume_role(**assume_role_kwargs)['Credentials']
+                return {
+                    "access_key": credentials['AccessKeyId'],
+                    "secret_key": credentials['SecretAccessKey'],
+                    "token": credentials['SessionToken'],
+                    "expiry_time": credentials['Expiration'].isoformat(),
+                }
             
-            return boto3.Session(
-                aws_access_key_id=credentials['AccessKeyId'],
-                aws_secret_access_key=credentials['SecretAccessKey'],
-                aws_session_token=credentials['SessionToken']
+            # Credenciales renovables: botocore vuelve a llamar a AssumeRole antes de que
+            # expiren, así que recolecciones de más de una hora no fallan a mitad de camino
+            credentials = RefreshableCredentials.create_from_metadata(
+                metadata=refresh_credentials(),
+                refresh_using=refresh_credentials,
+                method='sts-assume-role'
+            )
+            botocore_session = get_botocore_session()
+            # Primer proveedor de la cadena: tiene prioridad sobre variables de entorno y perfiles
+            botocore_session.get_component('credential_provider').insert_before(
+                'env', _StaticCredentialProvider(credentials)
             )
+            return boto3.Session(botocore_session=botocore_session)
         
         # Sin AssumeRole: usar perfil SSO si está configurado
         if profile_name:
@@ -260,42 +498,27 @@ class Collector:
         
         return boto3.Session()
     
-    def _should_collect_service(self, service_name: str) -> bool:
-        """Determinar si un servicio debe ser recolectado."""
-        if service_name in self.service_denylist:
-            return False
-        if self.service_allowlist and service_name not in self.service_allowlist:
-            return False
-        return True
-
-    def _effective_region_for_service(self, service_name: str) -> str:
-        """Devuelve la región efectiva para el servicio.
-
-        Los servicios globales siempre se consultan en us-east-1, independientemente
-        de qué regiones se estén recolectando, para evitar errores de endpoint y
-        resultados duplicados.
-        """
-        if service_name in _GLOBAL_SERVICES:
-            return "us-east-1"
-        return None  # None → usar la región del task normalmente
-    
+    def _filter_services(self, services: List[str]) -> List[str]:
+        """Aplicar denylist/allowlist a los servicios descubiertos (orden alfabético)."""
+        selected = set(services) - self.service_denylist
+        if self.service_allowlist:
+            selected &= self.service_allowlist
+        return sorted(selected)
+
     def collect(self):
         """Ejecutar recolección completa."""
         logger.info("Iniciando recolección de datos AWS")
         logger.info(f"Regiones: {', '.join(self.regions)}")
         logger.info(f"Threads: {self.max_threads}")
         
-        start_time = time.time()
+        self._start_time = time.time()
         
         # Descubrir servicios
         services = self.discovery.discover_services()
         logger.info(f"Servicios descubiertos: {len(services)}")
         
         # Filtrar servicios
-        services_to_collect = [
-            s for s in services
-            if self._should_collect_service(s)
-        ]
+        services_to_collect = self._filter_services(services)
         logger.info(f"Servicios a recolectar: {len(services_to_collect)}")
         self.stats["services_discovered"] = len(services_to_collect)
         
@@ -303,81 +526,141 @@ class Collector:
         try:
             account_metadata = self.metadata_collector.collect()
             metadata_file = self.output_dir / "metadata.json"
-            with open(metadata_file, 'w') as f:
-                json.dump(account_metadata, f, indent=2, default=str)
+            _write_json_atomic(metadata_file, account_metadata)
             logger.info(f"Metadatos guardados en {metadata_file}")
+            # El cache de List persistido es por cuenta: cargarlo ahora que se conoce
+            self.executor.load_list_cache(account_metadata.get("account_id"))
         except Exception as e:
             logger.warning(f"Error recolectando metadatos: {e}")
         
         # Recolectar por servicio y región.
-        # Los servicios globales se asignan solo a us-east-1 (una tarea, no N por región).
-        seen_global: Set[str] = set()
-        tasks = []
-        for service_name in services_to_collect:
-            fixed_region = self._effective_region_for_service(service_name)
-            if fixed_region is not None:
-                # Servicio global: solo una tarea
-                if service_name not in seen_global:
-                    tasks.append((service_name, fixed_region))
-                    seen_global.add(service_name)
-            else:
-                for region in self.regions:
-                    tasks.append((service_name, region))
+        # Los servicios globales se consultan siempre y solo en us-east-1 (una tarea, no N
+        # por región), independientemente de las regiones recolectadas, para evitar errores
+        # de endpoint y resultados duplicados. services_to_collect ya no tiene repetidos.
+        regions = self.regions
+        global_regions = ["us-east-1"]
+        # Orden de envío región por región (round-robin entre servicios): las tareas
+        # consecutivas van a servicios distintos en vez de encadenar todas las regiones
+        # de un mismo servicio
+        per_service = [
+            [(service_name, region) for region in
+             (global_regions if service_name in _GLOBAL_SERVICES else regions)]
+            for service_name in services_to_collect
+        ]
+        tasks = [
+            task
+            for round_tasks in itertools.zip_longest(*per_service)
+            for task in round_tasks
+            if task is not None
+        ]
+        global_services = [s for s in services_to_collect if s in _GLOBAL_SERVICES]
 
         logger.info(f"Tareas de recolección: {len(tasks)} "
-                    f"({len(seen_global)} servicios globales → us-east-1 únicamente)")
+                    f"({len(global_services)} servicios globales → us-east-1 únicamente)")
 
-        # Ejecutar en paralelo
-        with ThreadPoolExecutor(max_workers=self.max_threads) as executor:
-            futures = {
-                executor.submit(self._collect_service_region, service, region): (service, region)
-                for service, region in tasks
-            }
-            
-            with tqdm(total=len(futures), desc="Recolectando") as pbar:
-                for future in as_completed(futures):
-                    service, region = futures[future]
-                    try:
-                        future.result()
-                    except Exception as e:
-                        logger.error(f"Error en {service}/{region}: {e}")
-                        with self._stats_lock:
-                            self.stats["errors"].append({
-                                "service": service,
-                                "region": region,
-                                "error": str(e)
-                            })
-                    finally:
-                        pbar.update(1)
+        # Crear los clientes de todas las tareas antes de empezar a ejecutar
+        prewarm_start = time.time()
+        clients_ready = self.executor.prewarm(tasks)
+        logger.info(f"Clientes AWS precreados: {clients_ready} en {time.time() - prewarm_start:.1f}s")
+
+        # Fase 1: descubrir las operaciones de todas las tareas con un pool pequeño, para
+        # que el análisis de modelos no compita por CPU con las llamadas de la fase 2
+        discovery_start = time.time()
+        with ThreadPoolExecutor(max_workers=DEFAULT_DISCOVERY_THREADS) as discovery_pool:
+            task_operations = dict(zip(
+                tasks,
+                discovery_pool.map(lambda task: self.discovery.discover_operations(*task), tasks)
+            ))
+        logger.info(f"Operaciones descubiertas en {time.time() - discovery_start:.1f}s")
+
+        # Fase 2: ejecutar en paralelo. Cada tarea es un servicio/región completo (minutos),
+        # así que no se reduce el pool por debajo del número de tareas; solo se evita
+        # arrancar threads que nunca recibirían trabajo.
+        pool_size = max(1, min(self.max_threads, len(tasks)))
+        self._start_writers()
+        try:
+            with ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="ecad-collect") as executor:
+                futures = {
+                    executor.submit(
+                        self._collect_service_region, service, region, task_operations[(service, region)]
+                    ): (service, region)
+                    for service, region in tasks
+                }
+                
+                # Refrescar la barra como mucho cada 0.5s: con miles de tareas, un redibujado
+                # por tarea completada es escritura de terminal innecesaria
+                with tqdm(
+                    total=len(futures),
+                    desc="Recolectando",
+                    mininterval=0.5,
+                    miniters=max(1, len(futures) // 500),
+                    smoothing=0
+                ) as pbar:
+                    for future in as_completed(futures):
+                        service, region = futures[future]
+                        try:
+                            future.result()
+                        except Exception as e:
+                            logger.error(f"Error en {service}/{region}: {e}")
+                            with self._stats_lock:
+                                self.stats["errors"].append({
+                                    "service": service,
+                                    "region": region,
+                                    "error": str(e)
+                                })
+                        finally:
+                            pbar.update(1)
+        finally:
+            # Esperar a que se escriban todos los resultados encolados
+            self._stop_writers()
         
-        # Guardar estadísticas finales
-        elapsed = time.time() - start_time
-        self.stats["elapsed_seconds"] = elapsed
-        self.stats["timestamp"] = datetime.utcnow().isoformat()
+        self.executor.save_list_cache()
         
-        stats_file = self.output_dir / "collection_stats.json"
-        with open(stats_file, 'w') as f:
-            json.dump(self.stats, f, indent=2, default=str)
+        # Guardar estadísticas finales
+        stats_file = self.flush_stats()
         
-        logger.info(f"Recolección completada en {elapsed:.2f} segundos")
+        logger.info(f"Recolección completada en {self.stats['elapsed_seconds']:.2f} segundos")
         logger.info(f"Operaciones exitosas: {self.stats['operations_successful']}")
         logger.info(f"Operaciones fallidas: {self.stats['operations_failed']}")
         logger.info(f"Estadísticas guardadas en {stats_file}")
     
-    def _collect_service_region(self, service_name: str, region: str):
-        """Recolectar datos de un servicio en una región específica."""
+    def flush_stats(self, interrupted: bool = False) -> Path:
+        """Guardar collection_stats.json con el progreso actual (también tras una interrupción)."""
+        with self._stats_lock:
+            if self._start_time is not None:
+                self.stats["elapsed_seconds"] = time.time() - self._start_time
+            self.stats["timestamp"] = datetime.utcnow().isoformat()
+            if interrupted:
+                self.stats["interrupted"] = True
+            stats_file = self.output_dir / "collection_stats.json"
+            _write_json_atomic(stats_file, self.stats)
+        return stats_file
+    
+    def _collect_service_region(
+        self,
+        service_name: str,
+        region: str,
+        operations: Optional[Dict[str, Dict]] = None
+    ):
+        """Recolectar datos de un servicio en una región específica.
+        
+        `operations` son las operaciones ya descubiertas para la tarea; si no se
+        pasan, se descubren aquí.
+        """
         endpoint_key = f"{service_name}:{region}"
 
         # Early-exit: si ya sabemos que el endpoint no está disponible en esta región, saltar
-        with self._unavailable_lock:
-            if endpoint_key in self._unavailable_endpoints:
-                with self._stats_lock:
-                    self.stats["operations_skipped"] += 1
-                return
+        if endpoint_key in self._unavailable_endpoints:
+            with self._stats_lock:
+                self.stats["operations_skipped"] += 1
+            return
 
+        # Contadores de la tarea: se suman a self.stats con un solo lock al terminar
+        counts: Counter = Counter()
         try:
-            # Descubrir operaciones del servicio
-            operations = self.discovery.discover_operations(service_name, region)
+            # Descubrir operaciones del servicio (si no vienen de la fase de descubrimiento)
+            if operations is None:
+                operations = self.discovery.discover_operations(service_name, region)
             
             if not operations:
                 logger.debug(f"No se encontraron operaciones para {service_name} en {region}")
@@ -385,13 +668,9 @@ class Collector:
 
             # Reordenar para ejecutar primero operaciones críticas de inventario.
             # Esto evita que queden fuera por timeout en servicios muy grandes (ej. ec2).
-            ordered_operations = self._prioritize_operations(service_name, operations)
-            filtered_operations = self._filter_and_budget_operations(service_name, ordered_operations)
-            dropped = len(ordered_operations) - len(filtered_operations)
+            ordered_operations, dropped = self._plan_operations(service_name, operations)
             if dropped > 0:
-                with self._stats_lock:
-                    self.stats["operations_skipped"] += dropped
-            ordered_operations = filtered_operations
+                counts["operations_skipped"] += dropped
             
             safe_ops = [op for op, info in operations.items() if info.get("safe_to_call", False)]
             logger.debug(
@@ -413,8 +692,7 @@ class Collector:
                         f"{service_name}/{region}: timeout de tarea ({elapsed_service:.0f}s), "
                         f"se omiten {remaining} operaciones restantes"
                     )
-                    with self._stats_lock:
-                        self.stats["operations_skipped"] += remaining
+                    counts["operations_skipped"] += remaining
                     break
 
                 result = self.executor.execute_operation(
@@ -424,33 +702,25 @@ class Collector:
                 if result:
                     # Si el primer intento ya indica que el endpoint no existe, marcar y salir
                     if first_op and result.get("not_available"):
-                        with self._unavailable_lock:
-                            self._unavailable_endpoints.add(endpoint_key)
-                        with self._stats_lock:
-                            self.stats["operations_skipped"] += len(ordered_operations) - 1
+                        self._unavailable_endpoints.add(endpoint_key)
+                        counts["operations_skipped"] += len(ordered_operations) - 1
                         return
 
                     self._save_result(service_name, region, op_name, result)
-                    with self._stats_lock:
-                        self.stats["operations_executed"] += 1
+                    counts["operations_executed"] += 1
                     executed_count += 1
                     if result.get("success"):
-                        with self._stats_lock:
-                            self.stats["operations_successful"] += 1
+                        counts["operations_successful"] += 1
                     elif result.get("operational_error"):
-                        with self._stats_lock:
-                            self.stats["operations_failed"] += 1
-                            self.stats["operational_errors"] += 1
+                        counts["operations_failed"] += 1
+                        counts["operational_errors"] += 1
                     elif result.get("parameter_error"):
-                        with self._stats_lock:
-                            self.stats["operations_failed"] += 1
-                            self.stats["parameter_errors"] += 1
+                        counts["operations_failed"] += 1
+                        counts["parameter_errors"] += 1
                     else:
-                        with self._stats_lock:
-                            self.stats["operations_failed"] += 1
+                        counts["operations_failed"] += 1
                 else:
-                    with self._stats_lock:
-                        self.stats["operations_skipped"] += 1
+                    counts["operations_skipped"] += 1
 
                 first_op = False
             
@@ -460,59 +730,39 @@ class Collector:
         except Exception as e:
             logger.error(f"Error recolectando {service_name}/{region}: {e}")
             raise
+        finally:
+            if counts:
+                with self._stats_lock:
+                    for key, value in counts.items():
+                        self.stats[key] += value
 
     def _prioritize_operations(self, service_name: str, operations: Dict[str, Dict]) -> List[tuple]:
         """Ordenar operaciones para ejecutar primero inventario real y señales de alto valor."""
         service_key = (service_name or "").lower()
-        priority_map = {
-            "ec2": [
-                "DescribeInstances",
-                "DescribeVolumes",
-                "DescribeSnapshots",
-                "DescribeVpcs",
-                "DescribeSubnets",
-                "DescribeSecurityGroups",
-                "DescribeNetworkInterfaces",
-                "DescribeRouteTables",
-                "DescribeInternetGateways",
-                "DescribeNatGateways",
-                "DescribeAddresses",
-                "DescribeLaunchTemplates",
-            ],
-            "rds": [
-                "DescribeDBInstances",
-                "DescribeDBClusters",
-                "DescribeDBSnapshots",
-                "DescribeDBClusterSnapshots",
-                "DescribeDBSubnetGroups",
-                "DescribeDBParameterGroups",
-                "DescribeOptionGroups",
-            ],
-            "s3": ["ListBuckets"],
-            "lambda": ["ListFunctions"],
-            "dynamodb": ["ListTables"],
-            "iam": ["ListUsers", "ListRoles", "ListPolicies", "ListGroups"],
-            "ecs": ["ListClusters", "ListServices", "ListTasks"],
-            "eks": ["ListClusters", "ListNodegroups"],
-        }
-        preferred = priority_map.get(service_key, [])
+        preferred = _PRIORITY_OPERATIONS.get(service_key)
         if not preferred:
             return list(operations.items())
 
-        preferred_set = set(preferred)
-        priority_items: List[tuple] = []
-        remainder_items: List[tuple] = []
-
-        for name in preferred:
-            if name in operations:
-                priority_items.append((name, operations[name]))
-
-        for name, info in operations.items():
-            if name not in preferred_set:
-                remainder_items.append((name, info))
-
+        preferred_set = _PRIORITY_OPERATION_SETS[service_key]
+        priority_items = [(name, operations[name]) for name in preferred if name in operations]
+        remainder_items = [item for item in operations.items() if item[0] not in preferred_set]
         return priority_items + remainder_items
 
+    def _plan_operations(self, service_name: str, operations: Dict[str, Dict]) -> Tuple[List[tuple], int]:
+        """Operaciones a ejecutar (priorizadas, filtradas y con presupuesto) y cuántas se descartan.
+        
+        Las operaciones descubiertas no dependen de la región, así que el plan se calcula
+        en la primera región de cada servicio y el resto lo reutiliza.
+        """
+        plan = self._operation_plans.get(service_name)
+        if plan is None:
+            ordered_operations = self._prioritize_operations(service_name, operations)
+            filtered_operations = self._filter_and_budget_operations(service_name, ordered_operations)
+            plan = (filtered_operations, len(ordered_operations) - len(filtered_operations))
+            # Si dos regiones compiten, ambas calculan el mismo plan: se conserva el primero
+            plan = self._operation_plans.setdefault(service_name, plan)
+        return plan
+
     def _operation_budget_for_service(self, service_name: str) -> int:
         """Presupuesto máximo de operaciones por servicio."""
         heavy_budgets = {
@@ -552,19 +802,12 @@ class Collector:
         result: Dict
     ):
         """Guardar resultado de operación en archivo comprimido."""
-        # Estructura: raw/{service}/{region}/{operation}.json.gz
-        service_dir = self.raw_dir / service_name / region
-        service_dir.mkdir(parents=True, exist_ok=True)
-        
-        filename = f"{operation}.json.gz"
-        filepath = service_dir / filename
-        
         # Preparar metadata
         metadata = {
             "service": service_name,
             "region": region,
             "operation": operation,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self._result_timestamp(),
             "paginated": result.get("paginated", False),
             "success": result.get("success", False),
         }
@@ -579,9 +822,120 @@ class Collector:
             "error": result.get("error")
         }
         
-        # Guardar comprimido
-        with gzip.open(filepath, 'wt', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, default=str)
+        # Estructura: raw/{service}/{region}/{operation}.json.gz
+        region_dir = os.path.join(self._raw_dir_str, service_name, region)
+        if result.get("success") or result.get("data"):
+            filepath = os.path.join(region_dir, f"{operation}.json.gz")
+            write = self._write_output
+        else:
+            # Fallo sin datos: se agrega a raw/{service}/{region}/_errors.jsonl.gz
+            filepath = os.path.join(region_dir, ERRORS_FILENAME)
+            write = self._append_error
+        self._ensure_dir(region_dir)
+        
+        # Con writers activos se encola (put bloquea si la cola está llena: backpressure)
+        if self._save_queue is not None:
+            self._save_queue.put((write, filepath, output))
+        else:
+            write(filepath, output)
+    
+    def _result_timestamp(self) -> str:
+        """Timestamp UTC (ISO, por segundo) para la metadata de un resultado."""
+        now = int(time.time())
+        second, iso = self._timestamp_cache
+        if second != now:
+            iso = datetime.fromtimestamp(now, timezone.utc).replace(tzinfo=None).isoformat()
+            self._timestamp_cache = (now, iso)
+        return iso
+    
+    def _ensure_dir(self, directory: str) -> None:
+        """Preparar un directorio de salida solo la primera vez que se usa en el run."""
+        if directory in self._created_dirs:
+            return
+        with self._created_dirs_lock:
+            if directory not in self._created_dirs:
+                os.makedirs(directory, exist_ok=True)
+                # Los errores se agregan con append: descartar los de un run anterior en
+                # el mismo output-dir. Ocurre antes de encolar cualquier escritura al directorio.
+                try:
+                    os.remove(os.path.join(directory, ERRORS_FILENAME))
+                except FileNotFoundError:
+                    pass
+                self._created_dirs.add(directory)
+    
+    def _write_output(self, filepath: str, output: Dict) -> None:
+        """Serializar un resultado y guardarlo comprimido."""
+        # Se serializa página a página (orjson o el encoder en C de json.dumps) y cada
+        # fragmento pasa directo al compresor gzip: nunca se materializa el JSON completo.
+        # El modo indentado (depuración) no se puede fragmentar y se serializa de una vez.
+        if self.json_indent:
+            chunks = iter([_dumps_json(output, indent=self.json_indent)])
+        else:
+            chunks = _iter_json_chunks(output, RESULT_STREAM_DEPTH)
+        # wbits=31: formato gzip (cabecera + CRC), legible con gzip.open
+        compressor = zlib.compressobj(RESULT_GZIP_LEVEL, zlib.DEFLATED, 31)
+        with open(filepath, 'wb', buffering=RESULT_WRITE_BUFFER) as f:
+            for chunk in chunks:
+                f.write(compressor.compress(chunk))
+            f.write(compressor.flush())
+    
+    def _append_error(self, filepath: str, output: Dict) -> None:
+        """Agregar una operación fallida como línea JSON al archivo de errores de la región."""
+        # Un resultado exitoso de un run anterior quedaría indexado junto al fallo actual
+        stale_result = os.path.join(
+            os.path.dirname(filepath), f"{output['metadata']['operation']}.json.gz"
+        )
+        try:
+            os.remove(stale_result)
+        except FileNotFoundError:
+            pass
+        # Cada línea es un miembro gzip independiente: gzip.open lee los miembros concatenados
+        compressor = zlib.compressobj(RESULT_GZIP_LEVEL, zlib.DEFLATED, 31)
+        member = compressor.compress(_dumps_json(output) + b'\n') + compressor.flush()
+        # Varios writers pueden agregar al mismo archivo: append serializado
+        with self._errors_lock, open(filepath, 'ab') as f:
+            f.write(member)
+    
+    def _start_writers(self) -> None:
+        """Arrancar los threads que serializan y comprimen resultados en segundo plano."""
+        self._save_queue = queue.Queue(maxsize=self.max_threads * 4)
+        self._writer_threads = [
+            threading.Thread(target=self._writer_loop, name=f"ecad-writer-{i}", daemon=True)
+            for i in range(DEFAULT_WRITER_THREADS)
+        ]
+        for thread in self._writer_threads:
+            thread.start()
+    
+    def _stop_writers(self) -> None:
+        """Vaciar la cola de escritura y detener los writers."""
+        if self._save_queue is None:
+            return
+        for _ in self._writer_threads:
+            self._save_queue.put(None)
+        for thread in self._writer_threads:
+            thread.join()
+        self._writer_threads = []
+        self._save_queue = None
+    
+    def _writer_loop(self) -> None:
+        """Escribir resultados de la cola hasta recibir el marcador de fin (None)."""
+        save_queue = self._save_queue
+        while True:
+            item = save_queue.get()
+            if item is None:
+                return
+            write, filepath, output = item
+            try:
+                write(filepath, output)
+            except Exception as e:
+                metadata = output["metadata"]
+                logger.error(f"Error guardando {filepath}: {e}")
+                with self._stats_lock:
+                    self.stats["errors"].append({
+                        "service": metadata["service"],
+                        "region": metadata["region"],
+                        "error": str(e)
+                    })
 
 
 def main():
@@ -609,8 +963,8 @@ def main():
     parser.add_argument(
         "--max-threads",
         type=int,
-        default=int(os.getenv("ECAD_MAX_THREADS", str(DEFAULT_MAX_THREADS))),
-        help=f"Número máximo de threads paralelos (default: {DEFAULT_MAX_THREADS})"
+        default=int(os.getenv("ECAD_MAX_THREADS") or _default_max_threads()),
+        help=f"Número máximo de threads paralelos (default: 4 por CPU disponible, hasta {DEFAULT_MAX_THREADS})"
     )
     parser.add_argument(
         "--max-pages",
@@ -650,6 +1004,12 @@ def main():
         default=os.getenv("ECAD_INCLUDE_NONSAFE_OPS", "0").lower() in ("1", "true", "yes"),
         help="Incluir operaciones que requieren parámetros (puede aumentar errores/timeouts)"
     )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        default=os.getenv("ECAD_PRETTY_JSON", "0").lower() in ("1", "true", "yes"),
+        help="Guardar resultados con JSON indentado (más lento y más grande; para depuración)"
+    )
 
     args = parser.parse_args()
     
@@ -682,6 +1042,7 @@ def main():
         max_service_seconds=args.max_service_seconds,
         max_ops_per_service=args.max_ops_per_service,
         include_nonsafe_ops=args.include_nonsafe_ops,
+        pretty_json=args.pretty,
     )
     
     try:
@@ -689,6 +1050,11 @@ def main():
         sys.exit(0)
     except KeyboardInterrupt:
         logger.info("Recolección interrumpida por usuario")
+        # Conservar el progreso parcial: los resultados ya escritos siguen siendo válidos
+        try:
+            collector.flush_stats(interrupted=True)
+        except Exception as e:
+            logger.warning(f"No se pudieron guardar estadísticas parciales: {e}")
         sys.exit(1)
     except Exception as e:
         logger.error(f"Error fatal: {e}", exc_info=True)
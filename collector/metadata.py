@@ -3,8 +3,11 @@ Metadata Collector - Recolección de metadatos de cuenta AWS.
 """
 
 import logging
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
 import boto3
+from botocore.client import BaseClient
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 logger = logging.getLogger(__name__)
@@ -13,8 +16,10 @@ logger = logging.getLogger(__name__)
 class MetadataCollector:
     """Recolector de metadatos de cuenta AWS."""
     
-    def __init__(self, session: boto3.Session):
+    def __init__(self, session: boto3.Session, config: Optional[Config] = None):
         self.session = session
+        # Configuración de clientes (timeouts, reintentos) compartida con el Collector
+        self.config = config
     
     def collect(self) -> Dict[str, Any]:
         """Recolectar metadatos de la cuenta AWS."""
@@ -26,54 +31,86 @@ class MetadataCollector:
             "timestamp": None
         }
         
+        # Crear los clientes en este thread: la creación de clientes sobre una misma
+        # Session no es thread-safe. Los workers solo reciben las llamadas a la API.
+        clients = (
+            (self._collect_identity, self._client('sts')),
+            (self._collect_account_alias, self._client('iam')),
+            (self._collect_regions, self._client('ec2', region_name='us-east-1')),
+            (self._collect_organization, self._client('organizations')),
+        )
+        steps = [(step, client) for step, client in clients if client is not None]
+        # Las consultas son independientes: en paralelo el tiempo total es el de
+        # la más lenta y no la suma de todas
+        with ThreadPoolExecutor(max_workers=len(steps) or 1, thread_name_prefix="ecad-metadata") as pool:
+            for partial in pool.map(lambda pair: pair[0](pair[1]), steps):
+                metadata.update(partial)
+        
+        from datetime import datetime
+        metadata["timestamp"] = datetime.utcnow().isoformat()
+        
+        return metadata
+    
+    def _client(self, service_name: str, **kwargs) -> Optional[BaseClient]:
+        """Crear un cliente con la configuración compartida (None si falla)."""
+        try:
+            return self.session.client(service_name, config=self.config, **kwargs)
+        except Exception as e:
+            logger.debug(f"No se pudo crear cliente {service_name}: {e}")
+            return None
+    
+    def _collect_identity(self, sts: BaseClient) -> Dict[str, Any]:
+        """Account ID, ARN y user ID de la identidad actual."""
         try:
-            # Account ID
-            sts = self.session.client('sts')
             identity = sts.get_caller_identity()
-            metadata["account_id"] = identity.get("Account")
-            metadata["arn"] = identity.get("Arn")
-            metadata["user_id"] = identity.get("UserId")
-            
-            # Account Alias
-            try:
-                iam = self.session.client('iam')
-                aliases = iam.list_account_aliases()
-                if aliases.get('AccountAliases'):
-                    metadata["account_alias"] = aliases['AccountAliases'][0]
-            except Exception as e:
-                logger.debug(f"No se pudo obtener alias de cuenta: {e}")
-            
-            # Regions disponibles
-            try:
-                ec2 = self.session.client('ec2', region_name='us-east-1')
-                regions_response = ec2.describe_regions()
-                metadata["regions"] = [
+            return {
+                "account_id": identity.get("Account"),
+                "arn": identity.get("Arn"),
+                "user_id": identity.get("UserId"),
+            }
+        except Exception as e:
+            logger.warning(f"Error recolectando metadatos: {e}")
+            return {}
+    
+    def _collect_account_alias(self, iam: BaseClient) -> Dict[str, Any]:
+        """Alias de la cuenta (si tiene)."""
+        try:
+            aliases = iam.list_account_aliases()
+            if aliases.get('AccountAliases'):
+                return {"account_alias": aliases['AccountAliases'][0]}
+        except Exception as e:
+            logger.debug(f"No se pudo obtener alias de cuenta: {e}")
+        return {}
+    
+    def _collect_regions(self, ec2: BaseClient) -> Dict[str, Any]:
+        """Regiones disponibles para la cuenta."""
+        try:
+            regions_response = ec2.describe_regions()
+            return {
+                "regions": [
                     r['RegionName'] for r in regions_response.get('Regions', [])
                 ]
-            except Exception as e:
-                logger.debug(f"No se pudieron listar regiones: {e}")
-            
-            # Organization info (si aplica)
-            try:
-                orgs = self.session.client('organizations')
-                org_info = orgs.describe_organization()
-                metadata["organization"] = {
+            }
+        except Exception as e:
+            logger.debug(f"No se pudieron listar regiones: {e}")
+            return {}
+    
+    def _collect_organization(self, orgs: BaseClient) -> Dict[str, Any]:
+        """Organization info (si aplica)."""
+        try:
+            org_info = orgs.describe_organization()
+            return {
+                "organization": {
                     "id": org_info['Organization'].get('Id'),
                     "arn": org_info['Organization'].get('Arn'),
                     "master_account_id": org_info['Organization'].get('MasterAccountId')
                 }
-            except ClientError as e:
-                if e.response['Error']['Code'] != 'AWSOrganizationsNotInUseException':
-                    logger.debug(f"No se pudo obtener info de organización: {e}")
-            except Exception as e:
-                logger.debug(f"Error obteniendo organización: {e}")
-            
+            }
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'AWSOrganizationsNotInUseException':
+                logger.debug(f"No se pudo obtener info de organización: {e}")
         except Exception as e:
-            logger.warning(f"Error recolectando metadatos: {e}")
-        
-        from datetime import datetime
-        metadata["timestamp"] = datetime.utcnow().isoformat()
-        
-        return metadata
+            logger.debug(f"Error obteniendo organización: {e}")
+        return {}
 
 
@@ -7,18 +7,51 @@ run-YYYYMMDD-HHMMSS-ACCOUNTID (o run-YYYYMMDD-HHMMSS si no hay credenciales).
 """
 
 import os
-import re
+import string
+import time
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Cuenta resuelta por (AWS_PROFILE, AWS_REGION): (instante monotonic, account_id, alias).
+# Evita repetir STS/IAM en llamadas sucesivas dentro del mismo proceso.
+_IDENTITY_CACHE: Dict[Tuple[str, str], Tuple[float, str, Optional[str]]] = {}
+_IDENTITY_CACHE_TTL = 900  # segundos
+
+
+class _AliasTable(dict):
+    """Tabla para str.translate: cualquier carácter fuera de la lista blanca pasa a '-'."""
+    
+    def __missing__(self, codepoint: int) -> int:
+        return ord("-")
+
+
+# Letras, números, guiones y guión bajo se conservan en el alias del nombre de run
+_ALIAS_TABLE = _AliasTable((ord(c), ord(c)) for c in string.ascii_letters + string.digits + "_-")
+
+# Variables de entorno que por sí solas aportan credenciales a boto3
+_CREDENTIAL_ENV_VARS = (
+    "AWS_ACCESS_KEY_ID",
+    "AWS_PROFILE",
+    "AWS_WEB_IDENTITY_TOKEN_FILE",
+    "AWS_CONTAINER_CREDENTIALS_RELATIVE_URI",
+    "AWS_CONTAINER_CREDENTIALS_FULL_URI",
+)
+
+# Ficheros DMI/Xen donde Linux expone si la máquina es una instancia EC2
+_EC2_DMI_FILES = (
+    "/sys/devices/virtual/dmi/id/sys_vendor",
+    "/sys/devices/virtual/dmi/id/board_asset_tag",
+    "/sys/hypervisor/uuid",
+)
 
 
 def _safe_account_suffix(account_id: str, account_alias: str = None) -> str:
     """Sufijo seguro para nombre de directorio: solo dígitos o alias sanitizado."""
-    if account_id and re.match(r"^\d{12}$", account_id):
+    if _is_account_id(account_id):
         return account_id
     if account_alias:
-        # Permitir letras, números, guiones y guión bajo
-        safe = re.sub(r"[^a-zA-Z0-9_-]", "-", account_alias).strip("-")
+        safe = account_alias.translate(_ALIAS_TABLE).strip("-")
         if safe:
             return safe[:32]  # límite razonable de longitud
     return account_id or "unknown"
@@ -32,16 +65,71 @@ def get_run_dir(runs_base: str = "runs") -> str:
     """
     timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
     base = Path(runs_base)
+    # Sin ninguna fuente de credenciales no merece la pena importar boto3
+    if not _has_credential_source():
+        return str(base / f"run-{timestamp}")
     try:
-        import boto3
-        session = boto3.Session(
-            profile_name=os.getenv("AWS_PROFILE"),
-            region_name=os.getenv("AWS_REGION", "us-east-1"),
-        )
-        sts = session.client("sts")
-        identity = sts.get_caller_identity()
-        account_id = identity.get("Account")
-        account_alias = None
+        account_id, account_alias = _resolve_account()
+        suffix = _safe_account_suffix(account_id or "", account_alias)
+        name = f"run-{timestamp}-{suffix}"
+    except Exception:
+        name = f"run-{timestamp}"
+    return str(base / name)
+
+
+def _has_credential_source() -> bool:
+    """Indica si boto3 podría encontrar credenciales (sin importarlo)."""
+    if any(os.getenv(name) for name in _CREDENTIAL_ENV_VARS):
+        return True
+    credentials_file = os.getenv("AWS_SHARED_CREDENTIALS_FILE", "~/.aws/credentials")
+    config_file = os.getenv("AWS_CONFIG_FILE", "~/.aws/config")
+    if any(os.path.exists(os.path.expanduser(f)) for f in (credentials_file, config_file)):
+        return True
+    # El rol de instancia EC2 (IMDS) no deja rastro local en disco
+    if os.getenv("AWS_EC2_METADATA_DISABLED", "").lower() == "true":
+        return False
+    return _may_be_ec2()
+
+
+def _may_be_ec2() -> bool:
+    """False solo si Linux permite descartar que la máquina sea una instancia EC2."""
+    found = False
+    for path in _EC2_DMI_FILES:
+        try:
+            with open(path, "r", encoding="ascii", errors="replace") as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        found = True
+        # sys_vendor "Amazon EC2", asset tag "i-..." (Nitro) o uuid "ec2..." (Xen)
+        if value == "Amazon EC2" or value.startswith("i-") or value.lower().startswith("ec2"):
+            return True
+    # Sin /sys (macOS, Windows, contenedores restringidos) no se puede descartar IMDS
+    return not found
+
+
+def _is_account_id(account_id: Optional[str]) -> bool:
+    """Account ID de AWS válido: exactamente 12 dígitos ASCII."""
+    return bool(account_id) and len(account_id) == 12 and account_id.isascii() and account_id.isdigit()
+
+
+def _resolve_account() -> Tuple[str, Optional[str]]:
+    """Account ID y alias de las credenciales actuales (cacheados durante _IDENTITY_CACHE_TTL)."""
+    profile = os.getenv("AWS_PROFILE")
+    region = os.getenv("AWS_REGION", "us-east-1")
+    key = (profile or "", region)
+    cached = _IDENTITY_CACHE.get(key)
+    if cached and time.monotonic() - cached[0] < _IDENTITY_CACHE_TTL:
+        return cached[1], cached[2]
+
+    import boto3
+    session = boto3.Session(profile_name=profile, region_name=region)
+    sts = session.client("sts")
+    identity = sts.get_caller_identity()
+    account_id = identity.get("Account")
+    account_alias = None
+    # _safe_account_suffix prefiere el account_id: el alias solo hace falta si no es válido
+    if not _is_account_id(account_id):
         try:
             iam = session.client("iam")
             aliases = iam.list_account_aliases()
@@ -49,11 +137,8 @@ def get_run_dir(runs_base: str = "runs") -> str:
                 account_alias = aliases["AccountAliases"][0]
         except Exception:
             pass
-        suffix = _safe_account_suffix(account_id or "", account_alias)
-        name = f"run-{timestamp}-{suffix}"
-    except Exception:
-        name = f"run-{timestamp}"
-    return str(base / name)
+    _IDENTITY_CACHE[key] = (time.monotonic(), account_id, account_alias)
+    return account_id, account_alias
 
 
 if __name__ == "__main__":
@@ -97,7 +97,7 @@ def main():
                 print(f"\n   🔸 Operación: {op_name}")
                 print(f"      ✅ Éxito: {success}")
                 print(f"      📊 Recursos contados: {resource_count}")
-                print(f"      📁 Archivo: {file_path}")
+                print(f"      📁 Archivo: {file_path or op_info.get('errors_file', '')}")
                 
                 if success and file_path:
                     # Leer el archivo para contar instancias reales
@@ -86,6 +86,21 @@ for region_dir in regions:
                 print(f'  ❌ {op_name}: Error ({error_code})')
         except Exception as e:
             print(f'  ❌ {op_name}: Error leyendo archivo: {e}')
+    
+    # Operaciones fallidas sin datos: una línea JSON por operación
+    errors_file = region_dir / '_errors.jsonl.gz'
+    if errors_file.exists():
+        with gzip.open(errors_file, 'rt') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                op_name = data.get('metadata', {}).get('operation', 'Unknown')
+                if op_name.lower() not in ['liststacks', 'describestacks']:
+                    continue
+                error = data.get('error', {})
+                error_code = error.get('code', 'Unknown') if isinstance(error, dict) else 'Unknown'
+                print(f'  ❌ {op_name}: Error ({error_code})')
 
 print('\n' + '='*80)
 print('RESUMEN:')